@@ -0,0 +1,183 @@
+"""Minimal stand-in for the Domoticz plugin module, for benchmarks.
+
+Only the parts used by plugin.py are implemented. Every Device.Update is
+recorded so the runner can count device (database) writes.
+
+Connection does real HTTP on a helper thread per request; its onConnect /
+onMessage / onDisconnect callbacks are queued and delivered by pump(), so
+they run on the caller's thread like Domoticz runs them on the plugin thread.
+"""
+
+import http.client
+import queue
+import threading
+
+Devices = {}
+Images = {}
+Parameters = {}
+
+messages = []
+updates = []  # (unit, nValue, sValue)
+heartbeat = None
+verbose = False
+
+
+def _message(level, text):
+    messages.append((level, text))
+    if verbose:
+        print(f"{level}: {text}")
+
+
+def Log(text):
+    _message("Log", text)
+
+
+def Status(text):
+    _message("Status", text)
+
+
+def Error(text):
+    _message("Error", text)
+
+
+def Debug(text):
+    _message("Debug", text)
+
+
+def Heartbeat(seconds):
+    global heartbeat
+    heartbeat = seconds
+
+
+def reset():
+    """Forget all devices, images and recorded output."""
+    global heartbeat, _events
+    Devices.clear()
+    Images.clear()
+    Parameters.clear()
+    del messages[:]
+    del updates[:]
+    heartbeat = None
+    _events = queue.Queue()
+
+
+_events = queue.Queue()
+
+
+def pump(module, timeout=0.0):
+    """Deliver queued connection callbacks to the plugin module's hooks.
+
+    Waits up to `timeout` seconds for the first one; returns how many ran.
+    """
+    delivered = 0
+    while True:
+        try:
+            hook, args = _events.get(timeout=timeout) if timeout and not delivered else _events.get_nowait()
+        except queue.Empty:
+            return delivered
+        getattr(module, hook)(*args)
+        delivered += 1
+
+
+class Connection:
+    def __init__(self, Name="", Transport="", Protocol="", Address="", Port="", Baud=0):
+        self.Name = Name
+        self.Transport = Transport
+        self.Protocol = Protocol
+        self.Address = Address
+        self.Port = Port
+        self._http = None
+        self._connected = False
+        self._connecting = False
+
+    def Connected(self):
+        return self._connected
+
+    def Connecting(self):
+        return self._connecting
+
+    def Connect(self):
+        self._connecting = True
+        threading.Thread(target=self._connect, daemon=True).start()
+
+    def _connect(self):
+        conn = http.client.HTTPConnection(self.Address, int(self.Port), timeout=30)
+        try:
+            conn.connect()
+        except OSError as e:
+            self._connecting = False
+            _events.put(("onConnect", (self, 1, str(e))))
+            return
+        self._http = conn
+        self._connected = True
+        self._connecting = False
+        _events.put(("onConnect", (self, 0, "")))
+
+    def Send(self, Message):
+        threading.Thread(target=self._send, args=(self._http, Message), daemon=True).start()
+
+    def _send(self, conn, message):
+        try:
+            conn.request(message.get("Verb", "GET"), message.get("URL", "/"),
+                         body=message.get("Data"), headers=message.get("Headers", {}))
+            response = conn.getresponse()
+            data = {"Status": str(response.status), "Headers": dict(response.getheaders()), "Data": response.read()}
+        except (OSError, http.client.HTTPException):
+            if conn is self._http:
+                self.Disconnect()
+            return
+        _events.put(("onMessage", (self, data)))
+
+    def Disconnect(self):
+        conn, self._http = self._http, None
+        if conn is None:
+            return
+        self._connected = False
+        conn.close()
+        _events.put(("onDisconnect", (self,)))
+
+
+class Image:
+    def __init__(self, Filename):
+        self.Filename = Filename
+        self.ID = len(Images) + 100
+
+    def Create(self):
+        Images[self.Filename.rsplit(".", 1)[0]] = self
+
+
+class Device:
+    def __init__(self, Name="", Unit=0, TypeName="", Type=0, Subtype=0, Switchtype=0,
+                 Image=0, Options=None, Used=0, Description=""):
+        self.Name = Name
+        self.Unit = Unit
+        self.TypeName = TypeName
+        self.Type = Type
+        self.SubType = Subtype
+        self.SwitchType = Switchtype
+        self.Image = Image
+        self.Options = dict(Options or {})
+        self.Used = Used
+        self.Description = Description
+        self.nValue = 0
+        self.sValue = ""
+        self.TimedOut = 0
+        self.LastUpdate = ""
+
+    def Create(self):
+        Devices[self.Unit] = self
+
+    def Update(self, nValue=None, sValue=None, Options=None, TimedOut=0, **kwargs):
+        if nValue is not None:
+            self.nValue = nValue
+        if sValue is not None:
+            self.sValue = sValue
+        if Options is not None:
+            self.Options = dict(Options)
+        if "Name" in kwargs:
+            self.Name = kwargs["Name"]
+        self.TimedOut = TimedOut
+        updates.append((self.Unit, self.nValue, self.sValue))
+
+    def Delete(self):
+        Devices.pop(self.Unit, None)
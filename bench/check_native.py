@@ -0,0 +1,150 @@
+"""Check the native transport (DomoticzTransport) against a misbehaving fake LMS.
+
+Runs plugin.DomoticzTransport on the stub Domoticz module and checks that:
+
+- a reply with a stale or mismatched JSON-RPC id is ignored
+- a request without answer times out (check_timeouts)
+- a request on a kept-alive socket that is dropped is resent exactly once
+- a request on a fresh connection that is dropped is not resent: the
+  server may have run it already
+
+Exits non-zero when a check fails.
+
+Example:
+
+    python bench/check_native.py
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import Domoticz  # noqa: E402  (the stub in this folder)
+import plugin  # noqa: E402
+from fake_lms import FakeLMS  # noqa: E402
+
+
+class MisbehavingLMS(FakeLMS):
+    """FakeLMS where the command name selects how the request is answered:
+
+    hang       answer only after release is set
+    stale      answer with the id of the previous request
+    drop       drop the connection without answering (also drop_fresh)
+    drop_once  drop the connection on the first attempt, answer the next
+    """
+
+    def __init__(self):
+        super().__init__(players=1)
+        self.attempts = {}
+        self.release = threading.Event()
+
+    def handle(self, body):
+        request = json.loads(body)
+        name = request["params"][1][0]
+        with self.lock:
+            self.attempts[name] = attempt = self.attempts.get(name, 0) + 1
+        if name == "hang":
+            self.release.wait(10)
+        if name in ("drop", "drop_fresh") or (name == "drop_once" and attempt == 1):
+            return None, None
+        status, payload = super().handle(body)
+        if name == "stale":
+            payload["id"] = request["id"] - 1
+        return status, payload
+
+
+class Hooks:
+    """Routes the stub's connection callbacks to one transport."""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def onConnect(self, conn, status, description):
+        self.transport.on_connect(conn, status, description)
+
+    def onMessage(self, conn, data):
+        self.transport.on_message(conn, data)
+
+    def onDisconnect(self, conn):
+        self.transport.on_disconnect(conn)
+
+
+def request(transport, hooks, command, timeout=None, wait=5.0):
+    """Send one command (list) and pump callbacks until it completes; returns
+    (reply, error), or None when it did not complete within `wait` seconds."""
+    done = []
+    transport.send({"method": "slim.request", "params": ["", command]}, lambda reply, error: done.append((reply, error)), timeout)
+    deadline = time.time() + wait
+    while not done and time.time() < deadline:
+        Domoticz.pump(hooks, 0.05)
+        transport.check_timeouts()
+    return done[0] if done else None
+
+
+FAILED = []
+
+
+def check(name, ok, detail=""):
+    print(f"{'ok  ' if ok else 'FAIL'} {name}" + (f" ({detail})" if detail and not ok else ""))
+    if not ok:
+        FAILED.append(name)
+
+
+def main():
+    Domoticz.reset()
+    lms = MisbehavingLMS().start()
+    transport = plugin.DomoticzTransport("127.0.0.1", lms.port, connections=1, timeout=5)
+    hooks = Hooks(transport)
+    try:
+        # Warm up: later requests go out on the kept-alive connection
+        result = request(transport, hooks, ["serverstatus", 0, 1])
+        check("request answered", result is not None and result[1] is None and "result" in result[0], result)
+
+        result = request(transport, hooks, ["stale"], timeout=0.5)
+        check("stale reply id ignored", result is not None and isinstance(result[1], TimeoutError), result)
+
+        result = request(transport, hooks, ["hang"], timeout=0.5)
+        check("hung request times out", result is not None and isinstance(result[1], TimeoutError), result)
+        lms.release.set()
+        check("no request left behind", transport.pending() == 0 and not transport.busy, transport.pending())
+
+        result = request(transport, hooks, ["serverstatus", 0, 1])
+        check("connection usable after timeouts", result is not None and result[1] is None, result)
+
+        sent = transport.requests_sent
+        result = request(transport, hooks, ["drop_once"])
+        check("dropped socket: request resent", result is not None and result[1] is None, result)
+        check("dropped socket: sent twice", transport.requests_sent - sent == 2 and lms.attempts["drop_once"] == 2,
+              f"sent {transport.requests_sent - sent}, server saw {lms.attempts['drop_once']}")
+
+        sent = transport.requests_sent
+        result = request(transport, hooks, ["drop"])
+        check("dropped again: request fails", result is not None and isinstance(result[1], ConnectionError), result)
+        check("dropped again: resent only once", transport.requests_sent - sent == 2 and lms.attempts["drop"] == 2,
+              f"sent {transport.requests_sent - sent}, server saw {lms.attempts['drop']}")
+
+        # The connection is gone now: the next request opens a new one
+        sent = transport.requests_sent
+        result = request(transport, hooks, ["drop_fresh"])
+        check("dropped fresh connection: request fails", result is not None and isinstance(result[1], ConnectionError), result)
+        check("dropped fresh connection: not resent", transport.requests_sent - sent == 1 and lms.attempts["drop_fresh"] == 1,
+              f"sent {transport.requests_sent - sent}, server saw {lms.attempts['drop_fresh']}")
+    finally:
+        lms.release.set()
+        transport.close()
+        lms.stop()
+
+    if FAILED:
+        print(f"{len(FAILED)} check(s) failed")
+        sys.exit(1)
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
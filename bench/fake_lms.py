@@ -0,0 +1,243 @@
+"""Local stand-in for a Lyrion Music Server, for benchmarks.
+
+FakeLMS serves jsonrpc.js for a configurable number of simulated players
+with optional latency and failures. FakeCLI plays scripted notification
+lines on a CLI port, like the LMS CLI 'subscribe' stream.
+"""
+
+import json
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote
+
+
+class FakeLMS:
+    def __init__(self, players=3, playlists=20, latency=0.0, fail_rate=0.0, seed=1):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.lastscan = "1700000000"
+        self.requests = 0
+        self.bytes_sent = 0
+        self.by_command = {}
+
+        self.players = {}
+        for i in range(players):
+            mac = f"00:04:20:00:{i // 256:02x}:{i % 256:02x}"
+            self.players[mac] = {
+                "player_name": f"Player {i + 1}",
+                "power": 1,
+                "mode": "play",
+                "mixer volume": 30,
+                "playlist shuffle": 0,
+                "playlist repeat": 0,
+                "playlist_cur_index": 0,
+                "playlist_timestamp": 1700000000.0,
+                "playlist_tracks": 12,
+                "playlist_name": "",
+                "remote": 0,
+                "time": 0.0,
+                "duration": 240.0,
+                "rate": 1,
+            }
+        self.playlists = [{"id": 1000 + i, "playlist": f"Playlist {i + 1}"} for i in range(playlists)]
+        self.sync = {}  # slave mac -> master mac
+
+        self.server = None
+        self.thread = None
+
+    # ------------------------------------------------------------------
+    # Server
+    # ------------------------------------------------------------------
+    @property
+    def port(self):
+        return self.server.server_address[1]
+
+    def start(self, port=0):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # One buffered write per response: avoids Nagle/delayed-ACK stalls
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, payload = fake.handle(body)
+                if status is None:
+                    # No answer: drop the connection, like a server closing a kept-alive socket
+                    self.close_connection = True
+                    return
+                out = json.dumps(payload).encode()
+                with fake.lock:
+                    fake.bytes_sent += len(out)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(out)))
+                self.end_headers()
+                self.wfile.write(out)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def reset_counters(self):
+        with self.lock:
+            self.requests = 0
+            self.bytes_sent = 0
+            self.by_command = {}
+
+    # ------------------------------------------------------------------
+    # Simulation
+    # ------------------------------------------------------------------
+    def advance(self, seconds=10.0, track_change_rate=0.2):
+        """Move playback forward; some players go to their next track."""
+        with self.lock:
+            for st in self.players.values():
+                if st["mode"] != "play" or not st["power"]:
+                    continue
+                st["time"] += seconds
+                if st["time"] >= st["duration"] or self.random.random() < track_change_rate:
+                    st["time"] = 0.0
+                    st["playlist_cur_index"] = (st["playlist_cur_index"] + 1) % st["playlist_tracks"]
+
+    def handle(self, body):
+        if self.latency:
+            time.sleep(self.latency)
+        request = json.loads(body)
+        player, cmd = request["params"]
+        with self.lock:
+            self.requests += 1
+            self.by_command[cmd[0]] = self.by_command.get(cmd[0], 0) + 1
+            if self.fail_rate and self.random.random() < self.fail_rate:
+                return 500, {"error": "simulated failure"}
+            result = self.command(player, [str(c) for c in cmd])
+        return 200, {"id": request.get("id"), "method": "slim.request", "params": [player, cmd], "result": result}
+
+    def command(self, player, cmd):
+        name = cmd[0]
+        st = self.players.get(player)
+
+        if name == "serverstatus":
+            start, count = int(cmd[1]), int(cmd[2])
+            loop = [
+                {"playerid": mac, "name": p["player_name"], "connected": 1, "power": p["power"]}
+                for mac, p in list(self.players.items())[start:start + count]
+            ]
+            result = {"lastscan": self.lastscan, "player count": len(self.players), "version": "8.5.0"}
+            if loop:
+                result["players_loop"] = loop
+            return result
+
+        if name == "playlists":
+            start, count = int(cmd[1]), int(cmd[2])
+            return {"count": len(self.playlists), "playlists_loop": self.playlists[start:start + count]}
+
+        if st is None:
+            return {}
+
+        if name == "status":
+            result = dict(st)
+            master = self.sync.get(player, player if player in self.sync.values() else None)
+            if master:
+                result["sync_master"] = master
+                result["sync_slaves"] = ",".join(sorted(m for m, mm in self.sync.items() if mm == master))
+            if len(cmd) > 1:
+                idx = st["playlist_cur_index"]
+                result["playlist_loop"] = [{
+                    "playlist index": idx,
+                    "title": f"Track {idx + 1}",
+                    "artist": "Artist",
+                    "album": "Album",
+                    "duration": st["duration"],
+                }]
+            return result
+        if name == "mixer" and cmd[1] == "volume":
+            st["mixer volume"] = int(cmd[2])
+        elif name == "power":
+            st["power"] = int(cmd[1])
+        elif name == "button":
+            st["mode"] = {"play.single": "play", "pause.single": "pause", "stop": "stop"}.get(cmd[1], st["mode"])
+        elif name == "pause":
+            st["mode"] = "pause" if cmd[1] == "1" else "play"
+        elif name == "playlist" and cmd[1] in ("shuffle", "repeat"):
+            st[f"playlist {cmd[1]}"] = int(cmd[2])
+        elif name == "sync":
+            self.sync.pop(player, None)
+            if cmd[1] != "-":
+                self.sync[player] = self.sync.get(cmd[1], cmd[1])
+        return {}
+
+
+class FakeCLI:
+    """Accepts CLI connections and sends scripted '<playerid> <event...>' lines."""
+
+    def __init__(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(5)
+        self.clients = []
+        self.received = []
+        self.lock = threading.Lock()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    @property
+    def port(self):
+        return self.sock.getsockname()[1]
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with self.lock:
+                self.clients.append(conn)
+            threading.Thread(target=self._read, args=(conn,), daemon=True).start()
+
+    def _read(self, conn):
+        while True:
+            try:
+                data = conn.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            self.received.append(data.decode())
+
+    def wait_for_client(self, timeout=5.0):
+        end = time.time() + timeout
+        while time.time() < end:
+            if self.clients and self.received:
+                return True
+            time.sleep(0.01)
+        return False
+
+    def emit(self, playerid, *tokens):
+        line = " ".join(quote(str(t), safe="") for t in (playerid,) + tokens) + "\n"
+        with self.lock:
+            for conn in self.clients:
+                conn.sendall(line.encode())
+
+    def stop(self):
+        with self.lock:
+            for conn in self.clients:
+                conn.close()
+        self.sock.close()
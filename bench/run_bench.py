@@ -0,0 +1,277 @@
+"""Benchmark plugin.py against a fake LMS server and a stub Domoticz module.
+
+For every scenario (number of players) this reports:
+
+- wall time of a full poll cycle (heartbeats until every due player is polled)
+- the longest single onHeartbeat call (bounded by the heartbeat_budget option)
+- HTTP requests and response size per cycle
+- device writes (Device.Update calls) per cycle
+- onCommand latency
+- with --events: time from a CLI event to the device write
+
+With --options transport=native the plugin's Domoticz.Connection transport
+is used; connection callbacks are pumped between heartbeats. --servers N
+runs N fake servers (same players on each) from one plugin instance; the
+request counts are then summed over the servers.
+
+Scenarios go up to 25 players: 8 units per player and one player per 10
+units, in Domoticz's 255 units per hardware entry. Larger counts (e.g. the
+former 50-player scenario) are refused by the plugin and show as errors.
+
+Example:
+
+    python bench/run_bench.py --players 1,10,25 --latency 0.005
+    python bench/run_bench.py --options transport=native
+    python bench/run_bench.py --max-cycle-ms 500 --max-command-ms 5   # CI gate
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+sys.path.insert(0, HERE)
+
+import Domoticz  # noqa: E402  (the stub in this folder)
+import plugin  # noqa: E402
+from fake_lms import FakeCLI, FakeLMS  # noqa: E402
+
+
+def new_plugin(port, options="", cli_port=0, playlists=20, home=None, address="127.0.0.1"):
+    """Fresh hook target (LMSServerGroup) wired to the stub Domoticz globals;
+    its servers exist after plugin.onStart()."""
+    Domoticz.reset()
+    Domoticz.Parameters.update({
+        "Version": "bench",
+        "Address": address,
+        "Port": str(port),
+        "Username": "",
+        "Password": "",
+        "Mode1": "10",
+        "Mode2": str(playlists),
+        "Mode3": "False",
+        "Mode4": "Benchmark",
+        "Mode5": str(cli_port),
+        "Mode6": options,
+        "HomeFolder": (home or tempfile.mkdtemp(prefix="lms-bench-")) + os.sep,
+    })
+    plugin.Devices = Domoticz.Devices
+    plugin.Parameters = Domoticz.Parameters
+    plugin.Images = Domoticz.Images
+    plugin._plugin = plugin.LMSServerGroup()
+    return plugin._plugin
+
+
+HEARTBEATS = []
+
+
+def heartbeat():
+    """plugin.onHeartbeat(), timed."""
+    start = time.perf_counter()
+    plugin.onHeartbeat()
+    HEARTBEATS.append(time.perf_counter() - start)
+
+
+def busy(lms):
+    return (lms.cycleRunning or lms.taskFutures or (lms.native and lms.transport.pending())
+            or (not lms.breaker.is_open and lms.due_players(time.time())))
+
+
+def settle(group, timeout=10.0):
+    """Run heartbeats (and deliver connection callbacks) until no server
+    has a cycle or reply outstanding."""
+    end = time.time() + timeout
+    while time.time() < end and any(busy(lms) for lms in group.servers):
+        if any(lms.native for lms in group.servers):
+            Domoticz.pump(plugin, timeout=0.005)
+        else:
+            time.sleep(0.002)
+        heartbeat()
+
+
+def full_cycle(group):
+    """Run one heartbeat with the server cycle and every player due."""
+    for lms in group.servers:
+        lms.nextPoll = 0
+        lms.playerNextPoll = {}
+    start = time.perf_counter()
+    heartbeat()
+    settle(group)
+    return time.perf_counter() - start
+
+
+def wait_idle(lms, timeout=10.0):
+    end = time.time() + timeout
+    while time.time() < end and lms.dispatcher and (lms.dispatcher.pending() or lms.commandInFlight):
+        if lms.native:
+            Domoticz.pump(plugin, timeout=0.05)
+        else:
+            time.sleep(0.005)
+
+
+def measure_event(lms, fake, cli, timeout=5.0):
+    """Change one player's volume on the server, emit the CLI event and
+    drive heartbeats until the Volume device shows the new value."""
+    mac, units = next(iter(lms.playerUnits.items()))
+    unit = units[1]
+    new_volume = (int(Domoticz.Devices[unit].sValue or 0) + 7) % 100
+    with fake.lock:
+        fake.players[mac]["mixer volume"] = new_volume
+    fake.reset_counters()
+
+    start = time.perf_counter()
+    cli.emit(mac, "mixer", "volume", new_volume)
+    while time.perf_counter() - start < timeout:
+        plugin.onHeartbeat()
+        if lms.native:
+            Domoticz.pump(plugin)
+        if Domoticz.Devices[unit].sValue == str(new_volume):
+            return time.perf_counter() - start, fake.requests
+        time.sleep(0.002)
+    return None, fake.requests
+
+
+def run_scenario(players, cycles=5, commands=20, latency=0.0, fail_rate=0.0, playlists=20,
+                 options="", events=False, servers=1):
+    fakes = [
+        FakeLMS(players=players, playlists=playlists, latency=latency, fail_rate=fail_rate).start()
+        for _ in range(servers)
+    ]
+    fake = fakes[0]
+    cli = FakeCLI() if events else None
+    address = ",".join(f"127.0.0.1:{f.port}" for f in fakes) if servers > 1 else "127.0.0.1"
+    group = new_plugin(fake.port, options=options, cli_port=cli.port if cli else 0, playlists=playlists,
+                       address=address)
+
+    def reset_counters():
+        for f in fakes:
+            f.reset_counters()
+
+    try:
+        plugin.onStart()
+        lms = group.servers[0]
+        if cli:
+            cli.wait_for_client()
+            plugin.onHeartbeat()
+
+        # First cycle discovers the players and creates their devices
+        reset_counters()
+        first = full_cycle(group)
+        first_requests = sum(f.requests for f in fakes)
+
+        times, reqs, sizes, writes = [], [], [], []
+        del HEARTBEATS[:]
+        for _ in range(cycles):
+            for f in fakes:
+                f.advance()
+            reset_counters()
+            before = len(Domoticz.updates)
+            times.append(full_cycle(group))
+            reqs.append(sum(f.requests for f in fakes))
+            sizes.append(sum(f.bytes_sent for f in fakes))
+            writes.append(len(Domoticz.updates) - before)
+        heartbeat_max = max(HEARTBEATS)
+
+        event_latency = event_requests = None
+        if cli:
+            event_latency, event_requests = measure_event(lms, fake, cli)
+
+        volume_units = [units[1] for units in lms.playerUnits.values() if units[1]]
+        cmd_times = []
+        for i in range(commands if volume_units else 0):
+            unit = volume_units[i % len(volume_units)]
+            start = time.perf_counter()
+            plugin.onCommand(unit, "Set Level", 10 + i % 80, 0)
+            cmd_times.append(time.perf_counter() - start)
+        wait_idle(lms)
+    finally:
+        plugin.onStop()
+        for f in fakes:
+            f.stop()
+        if cli:
+            cli.stop()
+
+    return {
+        "servers": servers,
+        "players": players,
+        "devices": len(Domoticz.Devices),
+        "first_cycle_ms": first * 1000,
+        "first_cycle_requests": first_requests,
+        "cycle_ms_avg": statistics.mean(times) * 1000,
+        "cycle_ms_max": max(times) * 1000,
+        "heartbeat_ms_max": heartbeat_max * 1000,
+        "requests_per_cycle": statistics.mean(reqs),
+        "kb_per_cycle": statistics.mean(sizes) / 1024,
+        "writes_per_cycle": statistics.mean(writes),
+        "command_ms_avg": statistics.mean(cmd_times) * 1000 if cmd_times else 0.0,
+        "command_ms_max": max(cmd_times) * 1000 if cmd_times else 0.0,
+        "event_ms": event_latency * 1000 if event_latency is not None else None,
+        "event_requests": event_requests,
+        "errors": sum(1 for level, _ in Domoticz.messages if level == "Error"),
+    }
+
+
+def print_table(results):
+    header = (
+        f"{'servers':>7} {'players':>7} {'devices':>7} {'cycle ms':>9} {'max ms':>8} {'hb max':>7} {'req/cycle':>9} {'KB/cycle':>8} "
+        f"{'writes/cycle':>12} {'cmd ms':>7} {'cmd max':>8} {'event ms':>9} {'errors':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        event = f"{r['event_ms']:.1f}" if r["event_ms"] is not None else "-"
+        print(
+            f"{r['servers']:>7} {r['players']:>7} {r['devices']:>7} {r['cycle_ms_avg']:>9.1f} {r['cycle_ms_max']:>8.1f} {r['heartbeat_ms_max']:>7.1f} "
+            f"{r['requests_per_cycle']:>9.1f} {r['kb_per_cycle']:>8.1f} {r['writes_per_cycle']:>12.1f} {r['command_ms_avg']:>7.2f} "
+            f"{r['command_ms_max']:>8.2f} {event:>9} {r['errors']:>6}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--players", default="1,10,25", help="comma separated player counts (at most 25 fit in 255 units)")
+    parser.add_argument("--cycles", type=int, default=5, help="measured poll cycles per scenario")
+    parser.add_argument("--commands", type=int, default=20, help="onCommand calls per scenario")
+    parser.add_argument("--latency", type=float, default=0.005, help="server latency per request (s)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument("--playlists", type=int, default=20, help="playlists on the server (and Mode2)")
+    parser.add_argument("--options", default="", help="Advanced options (Mode6) passed to the plugin")
+    parser.add_argument("--servers", type=int, default=1, help="fake LMS servers, all in one plugin instance")
+    parser.add_argument("--events", action="store_true", help="also measure CLI event -> device latency")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    parser.add_argument("--max-cycle-ms", type=float, help="fail if an average cycle is slower")
+    parser.add_argument("--max-command-ms", type=float, help="fail if the slowest onCommand is slower")
+    args = parser.parse_args(argv)
+
+    results = [
+        run_scenario(
+            int(n), cycles=args.cycles, commands=args.commands, latency=args.latency,
+            fail_rate=args.fail_rate, playlists=args.playlists, options=args.options, events=args.events,
+            servers=max(1, args.servers),
+        )
+        for n in args.players.split(",") if n.strip()
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_table(results)
+
+    failed = False
+    for r in results:
+        if args.max_cycle_ms is not None and r["cycle_ms_avg"] > args.max_cycle_ms:
+            print(f"FAIL: {r['players']} players: cycle {r['cycle_ms_avg']:.1f} ms > {args.max_cycle_ms} ms")
+            failed = True
+        if args.max_command_ms is not None and r["command_ms_max"] > args.max_command_ms:
+            print(f"FAIL: {r['players']} players: onCommand {r['command_ms_max']:.2f} ms > {args.max_command_ms} ms")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
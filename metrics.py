@@ -0,0 +1,149 @@
+"""Performance metrics for the Lyrion plugin.
+
+plugin.py records request latencies, failures, poll cycles and device
+writes here and publishes a summary now and then (log line, optional
+custom sensor devices). Recording is thread-safe: requests are also sent
+from worker threads.
+"""
+
+import threading
+
+# Histogram bucket upper bounds in milliseconds; the last bucket is open
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Latencies in fixed buckets, plus count, total and maximum."""
+
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000
+        index = next((i for i, bound in enumerate(BUCKETS_MS) if ms <= bound), len(BUCKETS_MS))
+        self.buckets[index] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q):
+        """Upper bound (ms) of the bucket holding the q-th percentile; the
+        maximum for the open bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(BUCKETS_MS[index], self.max) if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+
+class Metrics:
+    """Counters and latency histograms for one summary interval.
+
+    take() returns the interval's figures and starts a new interval.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.latency = {}  # request kind ('status', 'mixer', ...) -> Histogram
+        self.errors = {}
+        self.timeouts = {}
+        self.cycles = Histogram()
+        self.polls = Histogram()
+        self.commands = Histogram()
+        self.writes = 0
+        self.writeCycles = 0
+
+    def request(self, kind, seconds, error=None, timeout=False):
+        with self.lock:
+            self.latency.setdefault(kind, Histogram()).add(seconds)
+            if timeout:
+                self.timeouts[kind] = self.timeouts.get(kind, 0) + 1
+            elif error:
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def cycle(self, seconds):
+        with self.lock:
+            self.cycles.add(seconds)
+
+    def poll(self, seconds):
+        with self.lock:
+            self.polls.add(seconds)
+
+    def command(self, seconds):
+        with self.lock:
+            self.commands.add(seconds)
+
+    def device_writes(self, writes):
+        """Writes of one poll cycle."""
+        with self.lock:
+            self.writes += writes
+            self.writeCycles += 1
+
+    def take(self):
+        """Summary of the interval as a dict; the counters start over."""
+        with self.lock:
+            requests = sum(h.count for h in self.latency.values())
+            summary = {
+                "requests": requests,
+                "errors": sum(self.errors.values()),
+                "timeouts": sum(self.timeouts.values()),
+                "latency_avg": sum(h.total for h in self.latency.values()) / requests if requests else 0.0,
+                "by_kind": {
+                    kind: {
+                        "count": h.count,
+                        "avg": h.avg,
+                        "p50": h.percentile(0.5),
+                        "p95": h.percentile(0.95),
+                        "max": h.max,
+                        "errors": self.errors.get(kind, 0),
+                        "timeouts": self.timeouts.get(kind, 0),
+                    }
+                    for kind, h in sorted(self.latency.items())
+                },
+                "cycles": self.cycles.count,
+                "cycle_avg": self.cycles.avg,
+                "cycle_max": self.cycles.max,
+                "poll_avg": self.polls.avg,
+                "poll_max": self.polls.max,
+                "command_avg": self.commands.avg,
+                "command_max": self.commands.max,
+                "writes_per_cycle": self.writes / self.writeCycles if self.writeCycles else 0.0,
+            }
+            self._reset()
+        return summary
+
+
+def format_summary(summary, seconds):
+    """Log lines for a summary covering `seconds`."""
+    period = f"{seconds / 60:.0f} min" if seconds >= 120 else f"{seconds:.0f} s"
+    lines = [
+        f"Metrics (last {period}): {summary['requests']} request(s), {summary['errors']} error(s), "
+        f"{summary['timeouts']} timeout(s); {summary['cycles']} cycle(s) avg {summary['cycle_avg']:.0f} ms "
+        f"max {summary['cycle_max']:.0f} ms; player polls avg {summary['poll_avg']:.0f} ms max {summary['poll_max']:.0f} ms; "
+        f"{summary['writes_per_cycle']:.1f} device writes/cycle; onCommand avg {summary['command_avg']:.1f} ms "
+        f"max {summary['command_max']:.1f} ms"
+    ]
+    kinds = [
+        f"{kind} n={k['count']} avg {k['avg']:.0f} p50 {k['p50']:.0f} p95 {k['p95']:.0f} max {k['max']:.0f} ms"
+        + (f" ({k['errors']} err, {k['timeouts']} timeout)" if k["errors"] or k["timeouts"] else "")
+        for kind, k in summary["by_kind"].items()
+    ]
+    if kinds:
+        lines.append("Latency: " + " | ".join(kinds))
+    return lines
@@ -0,0 +1,156 @@
+"""Typed player state and field-level diff for the Lyrion plugin.
+
+plugin.py turns every status reply into a PlayerState, compares it with
+the previous one and only touches the devices of the fields that changed.
+
+Like the other helper modules next to plugin.py (metrics.py,
+profiling.py, recording.py) this one is kept free of Domoticz, so it can
+be used (and tested) on its own.
+"""
+
+
+def to_int(value, default=0):
+    """LMS sends numbers as int, float or string ('35', '35.0', '35%')."""
+    try:
+        return int(float(str(value).replace("%", "")))
+    except (TypeError, ValueError):
+        return default
+
+
+def track_label(st):
+    """Text for the Track device: artist and title of what is playing."""
+    title = ""
+    artist = ""
+
+    rm = st.get("remoteMeta") or {}
+    if st.get("remote", 0) and rm:
+        title = rm.get("title", "") or title
+        artist = rm.get("artist", "") or artist
+
+    pl_loop = st.get("playlist_loop") or []
+    if not title and isinstance(pl_loop, list) and pl_loop:
+        title = pl_loop[0].get("title", "") or title
+        artist = pl_loop[0].get("artist", "") or artist
+
+    if not title:
+        title = st.get("current_title", "")
+
+    if not title:
+        label = " "
+    elif artist:
+        label = f"&#127908; {artist}<br>&#127925; {title}"
+    else:
+        label = title
+    return label[:255]
+
+
+class PlayerState:
+    """What the devices of one player show, parsed once from 'status'."""
+
+    __slots__ = ("power", "mode", "volume", "shuffle", "repeat", "track_index", "label", "playlist",
+                 "sync_master", "sync_slaves")
+
+    def __init__(self, power=0, mode="stop", volume=0, shuffle=0, repeat=0, track_index=None, label=" ",
+                 playlist=None, sync_master=None, sync_slaves=()):
+        self.power = power
+        self.mode = mode
+        self.volume = volume
+        self.shuffle = shuffle
+        self.repeat = repeat
+        self.track_index = track_index
+        self.label = label
+        self.playlist = playlist
+        self.sync_master = sync_master
+        self.sync_slaves = sync_slaves
+
+    @classmethod
+    def from_status(cls, st):
+        power = to_int(st.get("power", 0))
+        mode = st.get("mode", "stop")
+        playing = power != 0 and mode not in ("stop", "pause")
+
+        playlist = None
+        if playing:
+            name = st.get("playlist_name", "")
+            if to_int(st.get("playlist_tracks", 0)) > 1 and name not in ("", None) and not st.get("remote", 0):
+                playlist = name
+
+        return cls(
+            power=power,
+            mode=mode,
+            volume=to_int(st.get("mixer volume", 0)),
+            shuffle=to_int(st.get("playlist shuffle", 0)),
+            repeat=to_int(st.get("playlist repeat", 0)),
+            track_index=st.get("playlist_cur_index"),
+            label=track_label(st) if playing else " ",
+            playlist=playlist,
+            sync_master=st.get("sync_master") or None,
+            sync_slaves=tuple(sorted(m for m in str(st.get("sync_slaves") or "").split(",") if m)),
+        )
+
+    def diff(self, previous):
+        """{field: new value} for every field that differs from `previous`
+        (all fields when there is no previous state)."""
+        if previous is None:
+            return {field: getattr(self, field) for field in self.__slots__}
+        changes = {}
+        for field in self.__slots__:
+            value = getattr(self, field)
+            if value != getattr(previous, field):
+                changes[field] = value
+        return changes
+
+    def __eq__(self, other):
+        return isinstance(other, PlayerState) and not self.diff(other)
+
+    def __repr__(self):
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"PlayerState({fields})"
+
+
+class SyncGroups:
+    """Sync groups as the players report them (sync_master / sync_slaves).
+
+    Every status reply updates the view of one player; a master's reply
+    also settles who its slaves are. No extra queries are needed.
+    """
+
+    def __init__(self):
+        self.master_of = {}  # mac -> master mac, only for synced players
+
+    def groups(self):
+        """{master: (master, slave, ...)} for every group."""
+        groups = {}
+        for mac, master in self.master_of.items():
+            groups.setdefault(master, {master}).add(mac)
+        return {master: tuple(sorted(members, key=lambda m: (m != master, m))) for master, members in groups.items()}
+
+    def update(self, mac, master, slaves):
+        """Apply one player's status; True when the groups changed."""
+        before = self.groups()
+        if master is None:
+            self.master_of.pop(mac, None)
+            # A former master: its slaves are unsynced as well
+            for other in [m for m, mm in self.master_of.items() if mm == mac]:
+                del self.master_of[other]
+        else:
+            self.master_of[mac] = master
+            if mac == master:
+                for other in [m for m, mm in self.master_of.items() if mm == mac and m != mac and m not in slaves]:
+                    del self.master_of[other]
+                for slave in slaves:
+                    self.master_of[slave] = master
+        # A group of one is no group
+        for master_mac, members in self.groups().items():
+            if len(members) < 2:
+                for member in members:
+                    self.master_of.pop(member, None)
+        return self.groups() != before
+
+    def forget(self, mac):
+        """Player left: drop it (and its group when it was the master)."""
+        return self.update(mac, None, ())
+
+    def group_of(self, mac):
+        master = self.master_of.get(mac)
+        return self.groups().get(master, ()) if master else ()
@@ -8,16 +8,23 @@
             <li>Power / Play / Pause / Stop</li>
             <li>Volume (Dimmer)</li>
             <li>Track info (Text)</li>
-            <li>Playlists (Selector) - per player (player-specific list)</li>
+            <li>Playlists (Selector) - server-wide list, cached until the library changes</li>
             <li>Sync / Unsync</li>
             <li>Display text (via Actions device)</li>
             <li>Shuffle (Selector)</li>
             <li>Repeat (Selector)</li>
+            <li>Track progress (Text, mm:ss / mm:ss, counted locally between polls)</li>
+            <li>Group devices (All players and own groups): Control, Volume, Pause for all members at once</li>
+            <li>Push updates via the LMS CLI (port 9090), polling as fallback</li>
         </ul>
         <br/><span style="font-weight: bold;">Lyrion Server settings</span>
     </description>
     <params>
-        <param field="Address" label="Server IP" width="200px" required="true" default="192.168.1.6"/>
+        <param field="Address" label="Server IP" width="200px" required="true" default="192.168.1.6">
+            <description>
+                <br/>Several servers: separate with ',' and optionally add a port, e.g. 192.168.1.6, 192.168.1.7:9002
+            </description>
+        </param>
         <param field="Port" label="Port" width="100px" required="true" default="9000"/>
         <param field="Username" label="Username" width="150px">
             <description>
@@ -46,24 +53,710 @@
             </options>
         </param>
         <param field="Mode4" label="Message text" width="300px" default="Hello from Domoticz!" />
+        <param field="Mode5" label="CLI port (0 = polling only)" width="100px" default="9090">
+            <description>
+                <br/>Player changes are pushed by the LMS CLI; polling is then only a slow safety net
+            </description>
+        </param>
+        <param field="Mode6" label="Advanced options" width="300px" default="">
+            <description>
+                <br/>Optional, separated by ';'. Example: workers=4
+                <ul>
+                    <li>workers: number of players fetched in parallel (default 4)</li>
+                    <li>refresh_delay: seconds before a player is re-read after a command (default 2)</li>
+                    <li>poll_min / poll_max: bounds of the adaptive per-player poll interval (default 2 / 120)</li>
+                    <li>write_interval: minimum seconds between polled volume / track text writes; CLI events and commands show at once (default 5)</li>
+                    <li>meta_refresh: seconds between track metadata refreshes for radio streams (default 30)</li>
+                    <li>page_size: playlists per selector page, loaded one page per heartbeat (default 20)</li>
+                    <li>snapshot_interval: seconds between state snapshots for a warm start, 0 = only on stop (default 300)</li>
+                    <li>discovery_interval: seconds between full player list checks when the player count is unchanged (default 600)</li>
+                    <li>transport: 'requests' (worker threads), 'native' (non-blocking Domoticz connections) or 'replay' (answers from a recording, no server) (default requests)</li>
+                    <li>record: 1 = append every request and reply, with timing, to lyrion_record.jsonl in the plugin folder (default 0)</li>
+                    <li>record_max_mb: recording stops at this file size (default 50)</li>
+                    <li>replay / replay_speed: recording used by transport=replay (default lyrion_record.jsonl) and its speed, 1 = as recorded, 0 = no delay (default 1)</li>
+                    <li>progress_interval: seconds between Progress device writes while playing, 0 = no Progress devices (default 5); a deleted Progress device is not created again</li>
+                    <li>progress_drift: seconds the local progress may differ from the server before it is resynced (default 2)</li>
+                    <li>heartbeat_budget: milliseconds of poll work per heartbeat; due players wait for the next heartbeat (default 250)</li>
+                    <li>metrics_interval: seconds between performance summaries in the log (request latency per command, errors, cycle time, device writes), 0 = off (default 900)</li>
+                    <li>metrics_devices: 1 = also show the summary on Custom sensor devices (default 0)</li>
+                    <li>profile: 1 = profile the first poll cycles after start with cProfile, dumps go to the plugin folder (default 0)</li>
+                    <li>profile_cycles: poll cycles (and at most as many commands) per profiling run (default 5)</li>
+                    <li>profile_memory: 1 = also trace memory allocations (tracemalloc) during a run (default 0)</li>
+                    <li>profile_device: 1 = hidden switch '$Lyrion Profiling' that starts a run when switched on (default 0)</li>
+                    <li>all_players: 1 = 'All players' group devices (Control, Volume, Pause), 0 = none (default 1)</li>
+                    <li>groups: extra player groups, e.g. groups=Downstairs:Kitchen+Living,Upstairs:Bedroom (player names or macs)</li>
+                </ul>
+            </description>
+        </param>
     </params>
 </plugin>
 """
 
 import Domoticz
+import base64
+import collections
+import concurrent.futures
+import json
+import os
+import queue
 import requests
+import socket
+import threading
 import time
+import urllib3
+from urllib.parse import quote, unquote
+
+from metrics import Metrics, format_summary
+from player_state import PlayerState, SyncGroups
+from profiling import Profiler
+from recording import Recorder, ReplayTransport
+
+# Warm-start snapshot, stored in the plugin's home folder
+SNAPSHOT_FILE = "lyrion_snapshot.json"
+SNAPSHOT_VERSION = 1
+
+# Traffic recording (option record), replayed by transport=replay
+RECORD_FILE = "lyrion_record.jsonl"
+
+# Track metadata that only comes with the tagged status query
+TRACK_META_FIELDS = ("playlist_loop", "remoteMeta")
+
+# Per-player devices, in unit order (unit, unit + 1, ...); Domoticz units are 1-255
+MAX_UNIT = 255
+PLAYER_ROLES = ("main", "volume", "track", "actions", "shuffle", "repeat", "playlists", "progress")
+DEVICE_SUFFIX_ROLES = (
+    ("Volume", "volume"),
+    ("Track", "track"),
+    ("Actions", "actions"),
+    ("Shuffle", "shuffle"),
+    ("Repeat", "repeat"),
+    ("Playlists", "playlists"),
+    ("Progress", "progress"),
+)
+
+# Group devices (All players and the 'groups' option): Description 'group:<name>',
+# three units each, allocated from MAX_UNIT downwards
+GROUP_PREFIX = "group:"
+GROUP_ROLES = ("control", "volume", "pause")
+ALL_PLAYERS = "All players"
+
+# Metrics devices (option metrics_devices): Description 'metrics:<key>',
+# Custom sensors taking free units from MAX_UNIT downwards
+METRICS_PREFIX = "metrics:"
+METRIC_DEVICES = (
+    ("latency", "Request latency", "ms"),
+    ("requests", "Requests", "per min"),
+    ("errors", "Request errors", "errors"),
+    ("cycle", "Cycle time", "ms"),
+    ("writes", "Device writes", "per cycle"),
+)
+
+# Plugin control devices: Description 'control:<key>'
+CONTROL_PREFIX = "control:"
+
+
+class HttpTransport:
+    """Keep-alive JSON-RPC transport to jsonrpc.js.
+
+    One requests.Session is shared by all queries so the TCP connection
+    is reused between requests instead of being set up every time.
+    """
+
+    def __init__(self, url, auth=None, pool_size=4, timeout=10, debug_log=None):
+        self.url = url
+        self.auth = auth
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.debug_log = debug_log or (lambda msg: None)
+        self.session = None
+
+        # Statistics for connection reuse
+        self.requests_sent = 0
+        self.connections_opened = 0
+
+    def _open_session(self):
+        session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        self.session = session
+        return session
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    def _connections_in_pool(self):
+        """Total number of sockets opened so far by this session's pools."""
+        try:
+            pools = self.session.get_adapter(self.url).poolmanager.pools
+            return sum(pools[key].num_connections for key in pools.keys())
+        except Exception:
+            return 0
+
+    @staticmethod
+    def _dropped(error):
+        """True when an open keep-alive socket was closed under the request;
+        False when a new connection could not be made."""
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return False
+        reason = error.args[0] if error.args else None
+        return isinstance(reason, urllib3.exceptions.ProtocolError)
+
+    def post(self, data, timeout=None):
+        timeout = timeout or self.timeout
+        session = self.session or self._open_session()
+        before = self._connections_in_pool()
+        try:
+            r = session.post(self.url, json=data, auth=self.auth, timeout=timeout)
+        except requests.exceptions.ConnectionError as e:
+            # A pooled socket can be dead after a server restart: throw the
+            # pool away and try once more on a fresh connection. Connect
+            # errors (refused, timeout) are not retried, they would only
+            # fail again and double the wait.
+            if before == 0 or not self._dropped(e):
+                raise
+            self.debug_log(f"LMS connection lost ({e}), reconnecting")
+            self.close()
+            session = self._open_session()
+            before = 0
+            r = session.post(self.url, json=data, auth=self.auth, timeout=timeout)
+
+        self.requests_sent += 1
+        opened = self._connections_in_pool() - before
+        if opened > 0:
+            self.connections_opened += opened
+            self.debug_log(f"LMS new connection opened (requests={self.requests_sent}, connections={self.connections_opened})")
+        else:
+            self.debug_log(f"LMS connection reused (requests={self.requests_sent}, connections={self.connections_opened})")
+
+        r.raise_for_status()
+        return r.json()
+
+
+class DomoticzTransport:
+    """Non-blocking JSON-RPC transport over Domoticz.Connection (transport=native).
+
+    Requests go out over a small pool of keep-alive HTTP connections, one
+    request in flight per connection. Every request gets its own JSON-RPC
+    id; a reply carrying another id than the request on its connection is
+    ignored. Replies arrive via onConnect / onMessage / onDisconnect on the
+    Domoticz thread, so the callbacks may touch Devices; timeouts are
+    checked from onHeartbeat.
+    Callbacks are called as callback(reply, error).
+    """
+
+    def __init__(self, host, port, auth=None, connections=4, timeout=10, name="LMS", debug_log=None):
+        self.host = host
+        self.port = str(port)
+        self.timeout = timeout
+        self.debug_log = debug_log or (lambda msg: None)
+        self.headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "Connection": "keep-alive",
+            "Host": f"{host}:{self.port}",
+        }
+        if auth:
+            token = base64.b64encode(f"{auth[0]}:{auth[1]}".encode()).decode()
+            self.headers["Authorization"] = f"Basic {token}"
+
+        self.connections = [
+            Domoticz.Connection(Name=f"{name}-{i + 1}", Transport="TCP/IP", Protocol="HTTP", Address=host, Port=self.port)
+            for i in range(max(1, connections))
+        ]
+        self.names = {conn.Name for conn in self.connections}
+        self.requests = {}            # request id -> request dict
+        self.waiting = collections.deque()  # request ids not sent yet
+        self.busy = {}                # connection name -> request id
+        self.answered = set()         # connections that answered since they opened
+        self.next_id = 1
+
+        # Statistics for connection reuse
+        self.requests_sent = 0
+        self.connections_opened = 0
+
+    def owns(self, conn):
+        return conn.Name in self.names
+
+    def pending(self):
+        return len(self.requests)
+
+    def send(self, data, callback, timeout=None):
+        rid = self.next_id
+        self.next_id += 1
+        timeout = timeout or self.timeout
+        self.requests[rid] = {
+            "body": json.dumps(dict(data, id=rid)),
+            "callback": callback,
+            "timeout": timeout,
+            "deadline": time.time() + timeout,
+            "conn": None,
+            "reused": False,
+            "retried": False,
+        }
+        self.waiting.append(rid)
+        self._pump()
+        return rid
+
+    def close(self):
+        for conn in self.connections:
+            if conn.Connected() or conn.Connecting():
+                conn.Disconnect()
+        self.answered.clear()
+        self.requests = {}
+        self.waiting.clear()
+        self.busy = {}
+
+    def _pump(self):
+        """Put waiting requests on idle connections; connect more if needed."""
+        idle = [conn for conn in self.connections if conn.Name not in self.busy]
+        for conn in idle:
+            if not self.waiting:
+                return
+            if conn.Connected():
+                self._send_on(conn, self.waiting.popleft())
+
+        connecting = sum(1 for conn in idle if conn.Connecting())
+        for conn in idle:
+            if connecting >= len(self.waiting):
+                break
+            if not conn.Connected() and not conn.Connecting():
+                conn.Connect()
+                connecting += 1
+
+    def _send_on(self, conn, rid):
+        request = self.requests[rid]
+        request["conn"] = conn.Name
+        request["reused"] = conn.Name in self.answered
+        self.busy[conn.Name] = rid
+        conn.Send({"Verb": "POST", "URL": "/jsonrpc.js", "Headers": self.headers, "Data": request["body"]})
+        self.requests_sent += 1
+
+    def _finish(self, rid, reply, error):
+        request = self.requests.pop(rid, None)
+        if request is None:
+            return
+        if request["conn"] is not None and self.busy.get(request["conn"]) == rid:
+            del self.busy[request["conn"]]
+        self._pump()
+        request["callback"](reply, error)
+
+    def on_connect(self, conn, status, description):
+        if status == 0:
+            self.connections_opened += 1
+            self.debug_log(f"LMS new connection opened (requests={self.requests_sent}, connections={self.connections_opened})")
+            self._pump()
+            return
+        self.debug_log(f"LMS connection {conn.Name} failed: {description}")
+        if any(c.Connected() or c.Connecting() for c in self.connections):
+            return
+        # Server unreachable: fail what is waiting instead of queueing forever
+        for rid in list(self.waiting):
+            self.waiting.remove(rid)
+            self._finish(rid, None, ConnectionError(description or "connection failed"))
+
+    def on_message(self, conn, data):
+        self.answered.add(conn.Name)
+        rid = self.busy.pop(conn.Name, None)
+        error = None
+        reply = None
+        try:
+            status = int(data.get("Status", 0))
+            if status != 200:
+                raise ConnectionError(f"HTTP {status}")
+            reply = json.loads(data.get("Data") or b"null")
+            if not isinstance(reply, dict):
+                raise ValueError("reply is not a JSON object")
+        except (ConnectionError, TypeError, ValueError) as e:
+            error = e
+
+        reply_id = reply.get("id") if isinstance(reply, dict) else None
+        if reply_id is not None and reply_id != rid:
+            # One request in flight per connection: a reply with another id is
+            # stale, not this request's. The request then runs into its timeout.
+            self.debug_log(f"LMS reply id {reply_id} on {conn.Name} ignored, expected {rid}")
+            if rid in self.requests:
+                self.busy[conn.Name] = rid
+            self._pump()
+            return
+        if rid not in self.requests:
+            # Reply to a request that already timed out
+            self.debug_log(f"LMS late reply on {conn.Name} ignored")
+            self._pump()
+            return
+        self._finish(rid, reply if error is None else None, error)
+
+    def on_disconnect(self, conn):
+        self.answered.discard(conn.Name)
+        rid = self.busy.pop(conn.Name, None)
+        request = self.requests.get(rid) if rid is not None else None
+        if request is not None:
+            if request["retried"] or not request["reused"]:
+                # On a fresh connection the server may have run it already
+                # ('mixer volume +5' twice): fail instead of resending
+                self._finish(rid, None, ConnectionError("connection closed by server"))
+                return
+            # A kept-alive socket may be closed under us: resend once
+            self.debug_log(f"LMS connection {conn.Name} lost, resending request {rid}")
+            request["retried"] = True
+            request["conn"] = None
+            self.waiting.appendleft(rid)
+        self._pump()
+
+    def check_timeouts(self):
+        now = time.time()
+        for rid, request in list(self.requests.items()):
+            if request["deadline"] > now:
+                continue
+            if rid in self.waiting:
+                self.waiting.remove(rid)
+            elif request["conn"] is not None:
+                # Drop the socket: a late reply on it is not wanted
+                conn = next(c for c in self.connections if c.Name == request["conn"])
+                self.busy.pop(conn.Name, None)
+                request["conn"] = None
+                conn.Disconnect()
+            self._finish(rid, None, TimeoutError(f"no reply within {request['timeout']:g}s"))
+
+
+class CircuitBreaker:
+    """Open/closed state for the LMS server with exponential probe backoff.
+
+    While open, queries return immediately instead of waiting for the
+    request timeout; only a probe is sent every `delay` seconds.
+    """
+
+    def __init__(self, base_delay=5, max_delay=60, probe_timeout=2):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.probe_timeout = probe_timeout
+        self.is_open = False
+        self.delay = base_delay
+        self.next_probe = 0
+        self._lock = threading.Lock()
+
+    def open(self):
+        with self._lock:
+            if not self.is_open:
+                self.is_open = True
+                self.delay = self.base_delay
+                self.next_probe = time.time() + self.delay
+
+    def close(self):
+        with self._lock:
+            self.is_open = False
+            self.delay = self.base_delay
+
+    def claim_probe(self):
+        """True for exactly one caller once the backoff delay has expired."""
+        with self._lock:
+            now = time.time()
+            if now < self.next_probe:
+                return False
+            self.next_probe = now + self.delay
+            return True
+
+    def probe_failed(self):
+        with self._lock:
+            self.delay = min(self.delay * 2, self.max_delay)
+            self.next_probe = time.time() + self.delay
+            return self.delay
+
+
+class LMSEventListener(threading.Thread):
+    """Background reader for the LMS CLI notification stream (port 9090).
+
+    Subscribes to player events and puts (playerid, [tokens]) tuples on
+    the events queue. Nothing in here touches Devices: the plugin drains
+    the queue from onHeartbeat on the Domoticz thread.
+    """
+
+    SUBSCRIBE = "playlist,mixer,power,pause,play,stop,client,sync"
+
+    def __init__(self, host, port, auth, events, debug_log=None):
+        super().__init__(name="LMSEventListener", daemon=True)
+        self.host = host
+        self.port = port
+        self.auth = auth
+        self.events = events
+        self.debug_log = debug_log or (lambda msg: None)
+        self.connected = False
+        self._stop_event = threading.Event()
+        self._sock = None
+
+    def stop(self):
+        self._stop_event.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def parse_line(line):
+        """Split one CLI line into (playerid, [tokens]); None for non-player lines."""
+        tokens = [unquote(t) for t in line.strip().split(" ") if t]
+        if len(tokens) < 2 or tokens[0] in ("subscribe", "login", "listen"):
+            return None
+        return tokens[0], tokens[1:]
+
+    def _session(self):
+        sock = socket.create_connection((self.host, self.port), timeout=10)
+        self._sock = sock
+        if self.auth:
+            user, pwd = self.auth
+            sock.sendall(f"login {quote(user)} {quote(pwd)}\n".encode())
+        sock.sendall(f"subscribe {self.SUBSCRIBE}\n".encode())
+        sock.settimeout(1.0)
+
+        self.connected = True
+        self.debug_log(f"CLI event listener connected to {self.host}:{self.port}")
+
+        buf = b""
+        while not self._stop_event.is_set():
+            try:
+                chunk = sock.recv(4096)
+            except socket.timeout:
+                continue
+            if not chunk:
+                raise ConnectionError("CLI connection closed by server")
+            buf += chunk
+            while b"\n" in buf:
+                raw, buf = buf.split(b"\n", 1)
+                event = self.parse_line(raw.decode("utf-8", errors="replace"))
+                if event:
+                    self.events.put(event)
+
+    def run(self):
+        backoff = 5
+        while not self._stop_event.is_set():
+            try:
+                self._session()
+                backoff = 5
+            except Exception as e:
+                if not self._stop_event.is_set():
+                    self.debug_log(f"CLI event listener disconnected: {e}")
+            finally:
+                self.connected = False
+                if self._sock is not None:
+                    try:
+                        self._sock.close()
+                    except OSError:
+                        pass
+                    self._sock = None
+            if self._stop_event.wait(backoff):
+                break
+            backoff = min(backoff * 2, 60)
+
+
+class CommandDispatcher(threading.Thread):
+    """Sends player commands from a background thread.
+
+    Commands of the same kind for the same player collapse to the newest
+    one while they wait (e.g. only the last 'mixer volume' of a slider
+    drag is sent). Results go to the results queue as
+    (playerid, cmd_array, ok, seconds) for the Domoticz thread to report.
+    """
+
+    # Commands where only the latest value matters
+    COALESCE = {("mixer", "volume"), ("playlist", "shuffle"), ("playlist", "repeat"), ("power",), ("button",)}
+
+    def __init__(self, send, results, debug_log=None):
+        super().__init__(name="LMSCommandDispatcher", daemon=True)
+        self.send = send
+        self.results = results
+        self.debug_log = debug_log or (lambda msg: None)
+        self._pending = collections.OrderedDict()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._deadline = 0.0
+        self._inflight = None  # (playerid, cmd_array) being sent
+        self._seq = 0
+
+    @classmethod
+    def coalesce_kind(cls, cmd_array):
+        """Key under which a newer command replaces a waiting one, or None."""
+        words = [str(c) for c in cmd_array]
+        for size in (2, 1):
+            kind = tuple(words[:size])
+            if kind in cls.COALESCE:
+                # Relative changes ('mixer volume +5') must all be sent
+                if len(words) > size and words[size][:1] in ("+", "-"):
+                    return None
+                return kind
+        return None
+
+    def submit(self, playerid, cmd_array):
+        kind = self.coalesce_kind(cmd_array)
+        with self._cond:
+            if kind is None:
+                self._seq += 1
+                key = (playerid, self._seq)
+            else:
+                key = (playerid, kind)
+                if key in self._pending:
+                    self.debug_log(f"Command {' '.join(map(str, self._pending[key]))} for {playerid} superseded")
+            self._pending[key] = cmd_array
+            self._cond.notify()
+
+    def pending(self):
+        """Commands waiting or being sent."""
+        with self._cond:
+            return len(self._pending) + (self._inflight is not None)
+
+    def has_pending(self, playerid):
+        with self._cond:
+            if self._inflight is not None and self._inflight[0] == playerid:
+                return True
+            return any(key[0] == playerid for key in self._pending)
+
+    def take(self):
+        """Oldest waiting command as (playerid, cmd_array), or None.
+
+        For the native transport, which sends commands without the thread.
+        """
+        with self._cond:
+            if not self._pending:
+                return None
+            (playerid, _), cmd_array = self._pending.popitem(last=False)
+            return playerid, cmd_array
+
+    def stop(self, timeout=0.0):
+        """Stop the thread; what is still queued is sent first, as long as
+        `timeout` seconds allow. See unsent() for what was left."""
+        with self._cond:
+            self._stopping = True
+            self._deadline = time.time() + timeout
+            self._cond.notify()
+
+    def unsent(self):
+        """Commands still queued, as (playerid, cmd_array)."""
+        with self._cond:
+            return [(key[0], cmd_array) for key, cmd_array in self._pending.items()]
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if not self._pending or (self._stopping and time.time() >= self._deadline):
+                    return
+                (playerid, _), cmd_array = self._pending.popitem(last=False)
+                self._inflight = (playerid, cmd_array)
+
+            start = time.time()
+            ok = self.send(playerid, cmd_array) is not None
+            with self._cond:
+                self._inflight = None
+            self.results.put((playerid, cmd_array, ok, time.time() - start))
+
+
+class Gather(list):
+    """Sub-tasks a query task runs concurrently (see LMSPlugin.run_task)."""
+
+
+class PlaylistCatalog:
+    """Server-wide playlist list, loaded and shown in pages.
+
+    Pages are fetched one at a time (see LMSPlugin.process_playlist_pages)
+    so no single heartbeat loads the whole catalogue. On a page, level 0
+    is 'Select' and playlist n (0-based) sits at level (n + 1) * 10,
+    followed by '« Previous' / 'Next »' levels when there are more pages.
+    """
+
+    PREV = "\u00ab Previous"
+    NEXT = "Next \u00bb"
+
+    def __init__(self, page_size=20):
+        self.page_size = page_size
+        self.key = None
+        self.loaded = False
+        self.count = 0
+        self.pages = {}
+        self.level_by_name = {}  # name -> (page, level)
+        self._level_names = {}
+        self._by_level = {}
+
+    @property
+    def page_count(self):
+        return max(1, -(-self.count // self.page_size))
+
+    @property
+    def playlists(self):
+        return [p for page in sorted(self.pages) for p in self.pages[page]]
+
+    def reset(self, key, count):
+        self.key = key
+        self.loaded = True
+        self.count = count
+        self.pages = {}
+        self.level_by_name = {}
+        self._level_names = {}
+        self._by_level = {}
+
+    def missing_pages(self):
+        return [page for page in range(self.page_count) if page not in self.pages]
+
+    def set_page(self, page, playlists):
+        self.pages[page] = playlists
+        by_level = {(idx + 1) * 10: ("playlist", p) for idx, p in enumerate(playlists)}
+        for level, (_, p) in by_level.items():
+            self.level_by_name.setdefault(p["playlist"], (page, level))
+
+        names = ["Select"] + [p["playlist"] for p in playlists]
+        if not playlists and self.count == 0:
+            names.append("No playlists")
+        if page > 0:
+            by_level[len(names) * 10] = ("prev", None)
+            names.append(self.PREV)
+        if page < self.page_count - 1:
+            by_level[len(names) * 10] = ("next", None)
+            names.append(self.NEXT)
+        self._by_level[page] = by_level
+        self._level_names[page] = "|".join(names)
+
+    def level_names(self, page):
+        if page in self._level_names:
+            return self._level_names[page]
+        return "Select|Loading..." if self.loaded else "Select|No playlists"
+
+    def entry_for_level(self, page, level):
+        """('playlist', info), ('prev', None), ('next', None) or None."""
+        return self._by_level.get(page, {}).get(level)
+
 
 class LMSPlugin:
-    def __init__(self):
+    """Everything for one LMS server; see LMSServerGroup for several."""
+
+    def __init__(self, host="", port="", label="", namespace="", background=False):
+        # Server address (empty: the Address / Port parameters) and, with
+        # several servers, the log label and device namespace
+        self.host = host
+        self.port = port
+        self.logPrefix = f"[{label}] " if label else ""
+        self.namespace = namespace
+        self.backgroundCycle = background
+        self.cycleExecutor = None
         self.url = ""
         self.auth = None
+        self.transport = None
+        self.native = False
         self.pollInterval = 30
         self.nextPoll = 0
         self.players = []
 
-        # per-player playlists; no more global list
+        # playlists are server-wide: one catalog shared by all players,
+        # loaded page by page; each player's selector shows one page
         self.max_playlists = 10
+        self.catalog = PlaylistCatalog()
+        self.playlistPage = {}
+        self.playlistActive = {}
+        self.playlistPageRequests = set()
+        self.playlistPageLoading = None
 
         self.imageID = 0
         self.debug = False
@@ -77,21 +770,126 @@ class LMSPlugin:
         self.initialized = False
         self.createdDevices = 0
 
-        # Track-change detection
-        self.lastTrackIndex = {}
+        # Device index: mac -> unit tuple (PLAYER_ROLES order), unit -> (mac, role)
+        self.playerUnits = {}
+        self.unitIndex = {}
+
+        # Group devices: name -> member names/macs (None = all players),
+        # name -> unit tuple (GROUP_ROLES order), unit -> (name, role)
+        self.groupDefs = {}
+        self.groupUnits = {}
+        self.groupIndex = {}
+
+        # Last state applied to the devices of each player (see apply_player)
+        self.playerState = {}
+        self.syncGroups = SyncGroups()
+
+        # Track progress, counted locally from the last status:
+        # mac -> (elapsed, duration, rate, synced at, track key, mode)
+        self.progressAnchor = {}
+        self.progressInterval = 5.0  # seconden, 0 = geen Progress device
+        self.progressDrift = 2.0
+        # Players that have (had) a Progress device: one the user deleted is
+        # not created again
+        self.progressPlayers = set()
+
+        # Track metadata per player: (track key, metadata fields, fetched at)
+        self.trackMeta = {}
+        self.remoteMetaInterval = 30  # seconden
+
+        # Device write layer: last written (nValue, sValue) per unit,
+        # throttled values waiting to be written and per-cycle counters
+        self.deviceCache = {}
+        self.lastWriteTime = {}
+        self.pendingWrites = {}
+        self.writeInterval = 5.0  # seconden, voor volume en track tekst
+        self.writeStats = {"written": 0, "skipped": 0, "throttled": 0}
 
         # Nieuwe variabelen voor server-status tracking
         self.server_was_online = None   # None = nog niet bekend, daarna True/False
 
         self.last_success = 0
         self.offline_grace = 15  # seconden
+        self.breaker = CircuitBreaker()
+
+        # Push updates via the LMS CLI
+        self.cliPort = 9090
+        self.listener = None
+        self.listenerWasConnected = False
+        self.events = queue.Queue()
+        self.safetyPollInterval = 300
+
+        # Background command sending
+        self.dispatcher = None
+        self.commandInFlight = None
+        self.commandResults = queue.Queue()
+        self.commandBlockMax = 0.0
+        self.commandBlockWarn = 0.05  # seconden
+
+        # Advanced options (Mode6) and parallel player fetching
+        self.options = {}
+        self.workers = 4
+        self.executor = None
+
+        # Query tasks running in the background: (future, done) pairs
+        self.taskFutures = []
+        self.cycleRunning = False
+        self.polling = set()
+
+        # Single-player refresh after commands and events
+        self.refreshDelay = 2.0
+        self.refreshDue = {}
+        self.refreshing = set()
+
+        # Adaptive polling: per player next poll time and (state, interval)
+        self.pollMin = 2.0
+        self.pollMax = 120.0
+        self.playerNextPoll = {}
+        self.playerInterval = {}
+
+        # Time-sliced polling: poll work per heartbeat stops at the budget,
+        # a slice is `workers` players; budget use is logged per cycle
+        self.heartbeatBudget = 0.25  # seconden
+        self.heartbeatStart = 0.0
+        self.sliceTime = None  # seconden per slice, None until measured
+        self.budgetStats = {"heartbeats": 0, "used": 0.0, "max": 0.0, "over": 0, "deferred": 0}
+
+        # Performance metrics, summarized every metricsInterval seconds
+        self.metrics = Metrics()
+        self.metricsInterval = 900  # seconden, 0 = uit
+        self.metricsSince = 0.0
+        self.nextMetrics = 0.0
+        self.metricUnits = {}
+        self.cycleStart = 0.0
+
+        # On-demand profiling (options profile*, hidden '$Lyrion Profiling' switch)
+        self.profiler = Profiler()
+        self.profileCycles = 5
+        self.profileMemory = False
+        self.profileUnit = None
+
+        # Traffic recording (option record) for transport=replay
+        self.recorder = None
+
+        # Player discovery: full player list only when membership may have changed
+        self.knownPlayerCount = None
+        self.discoveryNeeded = True
+        self.discoveryInterval = 600  # seconden
+        self.nextDiscovery = 0
+        self.unavailablePlayers = set()
+
+        # Warm start: state snapshot in the plugin folder
+        self.snapshotFile = ""
+        self.snapshotInterval = 300
+        self.nextSnapshot = 0
+        self.lastStatus = {}
 
 
     # ------------------------------------------------------------------
     # Small helpers
     # ------------------------------------------------------------------
     def log(self, msg):
-        Domoticz.Log(msg)
+        Domoticz.Log(f"{self.logPrefix}{msg}")
 
     def log_player(self, dev, action):
         if not dev:
@@ -109,99 +907,889 @@ class LMSPlugin:
 
     def debug_log(self, msg):
         if self.debug:
-            Domoticz.Log(f"DEBUG: {msg}")
+            Domoticz.Log(f"{self.logPrefix}DEBUG: {msg}")
 
     def error(self, msg):
-        Domoticz.Error(msg)
+        Domoticz.Error(f"{self.logPrefix}{msg}")
 
     @staticmethod
-    def is_main_device_name(name: str) -> bool:
-        """True als dit het hoofd-device is (geen Volume/Track/... suffix)."""
-        return not any(x in name for x in ("Volume", "Track", "Actions", "Shuffle", "Repeat", "Playlists"))
+    def parse_options(text):
+        """Parse 'key=value;key=value' from the Advanced options field."""
+        options = {}
+        for part in (text or "").split(";"):
+            if "=" not in part:
+                continue
+            key, value = part.split("=", 1)
+            options[key.strip().lower()] = value.strip()
+        return options
+
+    def option_int(self, key, default):
+        try:
+            return int(self.options.get(key, default))
+        except ValueError:
+            self.error(f"Invalid value for option '{key}', using {default}")
+            return default
+
+    def option_float(self, key, default):
+        try:
+            return float(self.options.get(key, default))
+        except ValueError:
+            self.error(f"Invalid value for option '{key}', using {default}")
+            return default
+
+    @staticmethod
+    def device_role(name: str) -> str:
+        """Role of a player device, derived from its name suffix."""
+        for suffix, role in DEVICE_SUFFIX_ROLES:
+            if name.endswith(suffix):
+                return role
+        return "main"
+
+    @staticmethod
+    def group_role(name: str) -> str:
+        """Role of a group device, derived from its name suffix."""
+        for suffix, role in (("Volume", "volume"), ("Pause", "pause")):
+            if name.endswith(suffix):
+                return role
+        return "control"
+
+    @staticmethod
+    def parse_groups(text):
+        """'Name:member+member,Name:member' -> {name: [member, ...]}"""
+        groups = {}
+        for part in (text or "").split(","):
+            name, _, members = part.partition(":")
+            # '@' separates the server namespace in device descriptions
+            name = name.replace("@", "").strip()
+            members = [m.strip() for m in members.split("+") if m.strip()]
+            if name and members and name != ALL_PLAYERS:
+                groups[name] = members
+        return groups
+
+    def device_description(self, mac):
+        """Description of this server's player devices: the mac, plus
+        '@server' for every server but the first."""
+        return f"{mac}@{self.namespace}" if self.namespace else mac
+
+    def description_mac(self, description):
+        """Player mac of a device of this server, None for other servers."""
+        mac, _, namespace = (description or "").partition("@")
+        if not mac or namespace != self.namespace:
+            return None
+        return mac
 
     # ------------------------------------------------------------------
     # Domoticz lifecycle
     # ------------------------------------------------------------------
     def onStart(self):
-        self.log(f"Starting Plugin version {Parameters['Version']}")
-
-        _IMAGE = "lyrion"
-        creating_new_icon = _IMAGE not in Images
-        Domoticz.Image(f"{_IMAGE}.zip").Create()
-
-        if _IMAGE in Images:
-            self.imageID = Images[_IMAGE].ID
-            if creating_new_icon:
-                self.log("Icons created and loaded.")
-            else:
-                self.log(f"Icons found in database (ImageID={self.imageID}).")
-        else:
-            self.error(f"Unable to load icon pack '{_IMAGE}.zip'")
+        self.host = self.host or Parameters["Address"]
+        self.port = self.port or Parameters["Port"]
 
         self.pollInterval = int(Parameters.get("Mode1", 30))
         self.max_playlists = int(Parameters.get("Mode2", 50))
         self.debug = Parameters.get("Mode3", "False").lower() == "true"
 
         self.displayText = Parameters.get("Mode4", "")
+        self.options = self.parse_options(Parameters.get("Mode6", ""))
+        self.workers = max(1, self.option_int("workers", 4))
+        self.refreshDelay = max(0.0, self.option_float("refresh_delay", 2))
+        self.pollMin = max(1.0, self.option_float("poll_min", 2))
+        self.pollMax = max(self.pollMin, self.option_float("poll_max", 120))
+        self.writeInterval = max(0.0, self.option_float("write_interval", 5))
+        self.remoteMetaInterval = max(1.0, self.option_float("meta_refresh", 30))
+        self.progressInterval = max(0.0, self.option_float("progress_interval", 5))
+        self.progressDrift = max(0.5, self.option_float("progress_drift", 2))
+        self.heartbeatBudget = max(10, self.option_int("heartbeat_budget", 250)) / 1000.0
+        self.metricsInterval = max(0, self.option_int("metrics_interval", 900))
+        self.metricsSince = time.time()
+        self.nextMetrics = self.metricsSince + self.metricsInterval
+        self.catalog = PlaylistCatalog(page_size=max(1, self.option_int("page_size", 20)))
+        self.groupDefs = {ALL_PLAYERS: None} if self.option_int("all_players", 1) else {}
+        self.groupDefs.update(self.parse_groups(self.options.get("groups", "")))
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="LMSFetch")
         self.log(f"Display text = '{self.displayText}'")
         self.log(f"Starting initialization ......  Please wait ")
 
-        self.url = f"http://{Parameters['Address']}:{Parameters['Port']}/jsonrpc.js"
+        snapshot_file = SNAPSHOT_FILE
+        profile_prefix = "lyrion_profile"
+        record_file = RECORD_FILE
+        if self.namespace:
+            slug = "".join(c if c.isalnum() else "_" for c in self.namespace)
+            snapshot_file = SNAPSHOT_FILE.replace(".json", f"_{slug}.json")
+            profile_prefix += f"_{slug}"
+            record_file = RECORD_FILE.replace(".jsonl", f"_{slug}.jsonl")
+        record_file = os.path.join(Parameters.get("HomeFolder", ""), record_file)
+        self.snapshotFile = os.path.join(Parameters.get("HomeFolder", ""), snapshot_file)
+        self.profiler = Profiler(Parameters.get("HomeFolder", ""), profile_prefix)
+        self.profileCycles = max(1, self.option_int("profile_cycles", 5))
+        self.profileMemory = bool(self.option_int("profile_memory", 0))
+        self.snapshotInterval = max(0, self.option_int("snapshot_interval", 300))
+        self.discoveryInterval = max(30, self.option_int("discovery_interval", 600))
+        warm = self.load_snapshot()
+        if self.metricsInterval and self.option_int("metrics_devices", 0):
+            self.create_metric_devices()
+        if self.option_int("profile_device", 0):
+            self.create_profile_device()
+        if self.option_int("profile", 0):
+            self.start_profiling()
+
+        self.url = f"http://{self.host}:{self.port}/jsonrpc.js"
 
         user = Parameters.get("Username", "")
         pwd = Parameters.get("Password", "")
         self.auth = (user, pwd) if user else None
 
-        Domoticz.Heartbeat(5)
-        self.nextPoll = time.time() + 10
+        transport = self.options.get("transport", "requests").lower()
+        if transport not in ("requests", "native", "replay"):
+            self.error("Invalid value for option 'transport', using requests")
+            transport = "requests"
+        if transport == "replay":
+            self.transport = self.open_replay(record_file)
+            if self.transport is None:
+                transport = "requests"
+        elif self.option_int("record", 0):
+            try:
+                self.recorder = Recorder(record_file, max_bytes=max(1, self.option_int("record_max_mb", 50)) * 1024 * 1024,
+                                         log=self.log)
+                self.log(f"Recording LMS traffic to {record_file}")
+            except OSError as e:
+                self.error(f"Unable to record LMS traffic: {e}")
+        self.native = transport == "native"
+        self.dispatcher = CommandDispatcher(self.lms_query_raw, self.commandResults, debug_log=self.debug_log)
+        if self.native:
+            # Replies come back through onMessage: no threads, no blocking
+            self.transport = DomoticzTransport(self.host, self.port, self.auth, connections=self.workers,
+                                               name=f"LMS {self.namespace}" if self.namespace else "LMS",
+                                               debug_log=self.debug_log)
+            self.log(f"Native transport ({self.workers} connection(s))")
+        else:
+            if transport == "requests":
+                self.transport = HttpTransport(self.url, self.auth, pool_size=self.workers, debug_log=self.debug_log)
+            self.dispatcher.start()
+            # The server cycle runs here, outside the heartbeat budget; with
+            # several servers the poll slices too, so a slow server does not
+            # hold up the others
+            self.cycleExecutor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="LMSCycle")
+
+        try:
+            self.cliPort = int(Parameters.get("Mode5", "9090") or 0)
+        except ValueError:
+            self.cliPort = 0
+
+        if self.cliPort > 0 and transport != "replay":
+            self.listener = LMSEventListener(self.host, self.cliPort, self.auth, self.events, debug_log=self.debug_log)
+            self.listener.start()
+            self.log(f"Push updates enabled (CLI port {self.cliPort})")
+
+        # Short heartbeat: pending refreshes and command results are handled
+        # promptly, polling itself is still paced by nextPoll.
+        Domoticz.Heartbeat(1)
+        self.nextPoll = time.time() + (1 if warm else 10)
+        self.nextSnapshot = time.time() + self.snapshotInterval
 
     def onStop(self):
+        if self.profiler.active:
+            self.stop_profiling()
+        if self.initialized:
+            self.save_snapshot()
+        if self.dispatcher:
+            # Commands still queued (e.g. 'power 0' from a scene) go out first
+            self.dispatcher.stop(timeout=2.5)
+            if self.dispatcher.is_alive():
+                self.dispatcher.join(timeout=3)
+            for playerid, cmd_array in self.dispatcher.unsent():
+                self.log(f"Command {' '.join(map(str, cmd_array))} for {playerid} not sent: plugin stopping")
+            self.dispatcher = None
+        if self.listener:
+            self.listener.stop()
+            self.listener.join(timeout=3)
+            self.listener = None
+        if self.cycleExecutor:
+            self.cycleExecutor.shutdown(wait=True)
+            self.cycleExecutor = None
+        if self.executor:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        if self.transport:
+            self.transport.close()
+        if self.recorder:
+            self.recorder.close()
+            self.recorder = None
         self.log("Plugin stopped.")
 
+    def onDeviceRemoved(self, Unit):
+        if Unit == self.profileUnit:
+            self.profileUnit = None
+        for key, unit in list(self.metricUnits.items()):
+            if unit == Unit:
+                del self.metricUnits[key]
+
+        group = self.groupIndex.pop(Unit, None)
+        if group:
+            name, role = group
+            units = self.groupUnits.get(name)
+            if role == "control":
+                # Recreated with the next player list
+                self.groupUnits.pop(name, None)
+            elif units:
+                self.groupUnits[name] = tuple(None if u == Unit else u for u in units)
+            self.deviceCache.pop(Unit, None)
+            self.pendingWrites.pop(Unit, None)
+            self.debug_log(f"Device {Unit} ({role}) removed for group '{name}'")
+            return
+
+        entry = self.unitIndex.pop(Unit, None)
+        if not entry:
+            return
+        mac, role = entry
+        units = self.playerUnits.get(mac)
+        if not units:
+            return
+        if role == "main":
+            # Without its main device the player is recreated on the next poll
+            del self.playerUnits[mac]
+        else:
+            self.playerUnits[mac] = tuple(None if u == Unit else u for u in units)
+        self.deviceCache.pop(Unit, None)
+        self.pendingWrites.pop(Unit, None)
+        self.debug_log(f"Device {Unit} ({role}) removed for player {mac}")
+
+    def onConnect(self, Connection, Status, Description):
+        if self.native and self.transport.owns(Connection):
+            self.transport.on_connect(Connection, Status, Description)
+
+    def onMessage(self, Connection, Data):
+        if self.native and self.transport.owns(Connection):
+            if self.profiler.active:
+                # Native transport: replies are processed here
+                self.profiler.call(self.transport.on_message, Connection, Data)
+            else:
+                self.transport.on_message(Connection, Data)
+
+    def onDisconnect(self, Connection):
+        if self.native and self.transport.owns(Connection):
+            self.transport.on_disconnect(Connection)
+
     def onHeartbeat(self):
+        self.heartbeatStart = time.time()
+        try:
+            if self.profiler.active:
+                self.profiler.call(self.heartbeat)
+            else:
+                self.heartbeat()
+        finally:
+            self.track_budget(time.time() - self.heartbeatStart)
+        if self.profiler.finished:
+            self.stop_profiling()
+
+    def heartbeat(self):
+        if self.snapshotInterval and self.initialized and time.time() >= self.nextSnapshot:
+            self.nextSnapshot = time.time() + self.snapshotInterval
+            self.save_snapshot()
+        self.flush_pending_writes()
+        self.update_progress()
+        if self.metricsInterval and time.time() >= self.nextMetrics:
+            self.publish_metrics()
+        if self.native:
+            self.transport.check_timeouts()
+            self.pump_commands()
+        self.process_command_results()
+        self.process_events()
+        self.process_tasks()
+        self.process_refreshes()
+        self.process_playlist_pages()
+        if self.breaker.is_open:
+            # Server offline: no polling, only a background probe now and then
+            if self.breaker.claim_probe():
+                if self.native:
+                    self.probe_server_async()
+                else:
+                    self.executor.submit(self.probe_server)
+            return
         if time.time() >= self.nextPoll:
-            self.nextPoll = time.time() + self.pollInterval
+            self.nextPoll = time.time() + self.current_poll_interval()
             self.updateEverything()
+        else:
+            self.poll_due_players()
+
+    def track_budget(self, used):
+        stats = self.budgetStats
+        stats["heartbeats"] += 1
+        stats["used"] += used
+        stats["max"] = max(stats["max"], used)
+        if used > self.heartbeatBudget:
+            stats["over"] += 1
+
+    def log_budget_stats(self):
+        stats = self.budgetStats
+        if stats["heartbeats"]:
+            budget = self.heartbeatBudget
+            self.debug_log(
+                f"Heartbeat budget {budget * 1000:.0f} ms: avg {stats['used'] / stats['heartbeats'] / budget:.0%}, "
+                f"max {stats['max'] / budget:.0%}, {stats['over']} of {stats['heartbeats']} over, "
+                f"{stats['deferred']} poll slice(s) deferred, slice ~{(self.sliceTime or 0) * 1000:.0f} ms"
+            )
+        self.budgetStats = {"heartbeats": 0, "used": 0.0, "max": 0.0, "over": 0, "deferred": 0}
+
+    def publish_metrics(self):
+        """Log the metrics of the last interval and show them on the metrics
+        devices, if any; the next interval starts empty."""
+        now = time.time()
+        seconds = max(1.0, now - self.metricsSince)
+        self.metricsSince = now
+        self.nextMetrics = now + self.metricsInterval
+        summary = self.metrics.take()
+        for line in format_summary(summary, seconds):
+            self.log(line)
+
+        values = {
+            "latency": summary["latency_avg"],
+            "requests": summary["requests"] * 60 / seconds,
+            "errors": summary["errors"] + summary["timeouts"],
+            "cycle": summary["cycle_avg"],
+            "writes": summary["writes_per_cycle"],
+        }
+        for key, unit in self.metricUnits.items():
+            self.update_device(unit, 0, f"{values[key]:.1f}")
+
+    def current_poll_interval(self):
+        """Interval of the server cycle (serverstatus, discovery, playlists).
+
+        Players have their own schedule, see player_poll_interval. Full
+        polls are only a safety net while the CLI stream is connected.
+        """
+        if self.listener and self.listener.connected:
+            return max(self.pollInterval, self.safetyPollInterval)
+        return max(self.pollInterval, min(self.pollInterval * 3, self.pollMax))
 
     # ------------------------------------------------------------------
-    # LMS JSON helper
+    # ADAPTIVE PLAYER POLLING
     # ------------------------------------------------------------------
-    def lms_query_raw(self, player, cmd_array):
-        data = {"id": 1, "method": "slim.request", "params": [player, cmd_array]}
+    @staticmethod
+    def track_remaining(st):
+        """Seconds left in the current track, or None when unknown."""
+        try:
+            duration = float(st.get("duration", 0) or 0)
+            elapsed = float(st.get("time", 0) or 0)
+            rate = float(st.get("rate", 1) or 1)
+        except (TypeError, ValueError):
+            return None
+        if duration <= 0 or rate <= 0:
+            return None
+        return max(0.0, (duration - elapsed) / rate)
+
+    @staticmethod
+    def track_key(st):
+        """Identifies the current track: a new index, playlist or stream title
+        means a new track."""
+        remote = st.get("remote", 0)
+        return (st.get("playlist_cur_index"), st.get("playlist_timestamp"), st.get("current_title") if remote else None)
+
+    def player_poll_interval(self, st):
+        """Seconds until a player is polled again, based on its last status."""
+        if not st:
+            interval = self.pollInterval
+        elif int(st.get("power", 0)) == 0:
+            interval = self.pollMax
+        elif st.get("mode") == "play":
+            interval = self.pollInterval
+            remaining = self.track_remaining(st)
+            if remaining is not None and remaining < interval:
+                # Catch the track change right after it happens
+                interval = remaining + 0.5
+        else:
+            interval = self.pollInterval * 3
+
+        interval = min(max(interval, self.pollMin), self.pollMax)
+        if self.listener and self.listener.connected:
+            interval = max(interval, self.safetyPollInterval)
+        return interval
+
+    def schedule_player(self, mac, st):
+        if st:
+            self.lastStatus[mac] = st
+        interval = self.player_poll_interval(st)
+        self.playerInterval[mac] = (st.get("mode", "stop") if int(st.get("power", 0)) else "off", interval)
+        delay = interval
+        if mac not in self.playerNextPoll:
+            # First poll: spread the players over the interval, so that their
+            # next polls do not all land on the same heartbeat
+            macs = [p.get("playerid") for p in self.players]
+            if mac in macs:
+                delay = interval * (macs.index(mac) + 1) / len(macs)
+        self.playerNextPoll[mac] = time.time() + delay
+
+    def due_players(self, now):
+        return [
+            p.get("playerid") for p in self.players
+            if p.get("playerid") and p.get("playerid") not in self.polling
+            and self.playerNextPoll.get(p.get("playerid"), 0) <= now
+        ]
+
+    def poll_players(self, macs, done=None, background=False):
+        """Fetch the players concurrently, then apply them; done() afterwards.
+        With background=True the fetch runs on the cycle thread."""
+        if not macs:
+            if done:
+                done()
+            return
+        self.polling.update(macs)
+        start = time.time()
+
+        def polled(results):
+            self.polling.difference_update(macs)
+            self.metrics.poll(time.time() - start)
+            self.debug_log(f"Fetched {len(macs)} player(s) in {time.time() - start:.2f}s")
+            for mac, st in zip(macs, results or [{}] * len(macs)):
+                player = self.find_player(mac)
+                if player is None:
+                    continue
+                if not st:
+                    # Fetch failed: leave the state and devices alone, retry later
+                    self.playerNextPoll[mac] = time.time() + self.pollInterval
+                    continue
+                self.apply_player(player, st)
+                self.schedule_player(mac, st)
+            self.update_group_devices()
+            if done:
+                done()
+
+        task = self.gather_task([self.fetch_player_task(mac) for mac in macs])
+        if background:
+            self.run_in_cycle(task, polled)
+        else:
+            self.run_then(task, polled)
+
+    def poll_due_players(self):
+        """Time-sliced polling: the due players, most overdue first, in slices
+        of `workers` until this heartbeat's budget is spent; the others wait
+        for the next heartbeat. Queued commands go first: no poll work then.
+        The first slice always runs, so a slow server still makes progress.
+
+        When a blocking slice does not fit in the budget at all (a slow
+        server, or not measured yet), one slice at a time is polled on the
+        cycle thread instead."""
+        due = sorted(self.due_players(time.time()), key=lambda mac: self.playerNextPoll.get(mac, 0))
+        if due and not self.native and not self.backgroundCycle and (
+                self.sliceTime is None or self.sliceTime > self.heartbeatBudget):
+            if self.polling or self.commands_waiting():
+                self.budgetStats["deferred"] += 1
+                return
+            start = time.time()
+            self.poll_players(due[:self.workers], lambda: self.slice_done(time.time() - start), background=True)
+            return
+
+        first = True
+        while due:
+            used = time.time() - self.heartbeatStart
+            if self.commands_waiting() or used >= self.heartbeatBudget or (
+                    not first and used + (self.sliceTime or 0) > self.heartbeatBudget):
+                self.budgetStats["deferred"] += 1
+                return
+            first = False
+            batch, due = due[:self.workers], due[self.workers:]
+            start = time.time()
+            self.poll_players(batch)
+            # Blocking transport: what a slice costs (asynchronous ones cost ~0)
+            self.slice_done(time.time() - start)
+
+    def slice_done(self, seconds):
+        self.sliceTime = seconds if self.sliceTime is None else 0.7 * self.sliceTime + 0.3 * seconds
+
+    def commands_waiting(self):
+        """True while user commands still have to be sent."""
+        return self.commandInFlight is not None or bool(self.dispatcher and self.dispatcher.pending())
+
+    def log_poll_rates(self):
+        if not self.debug or not self.playerInterval:
+            return
+        rates = ", ".join(
+            f"{(self.find_player(mac) or {}).get('name', mac)}={state} {interval:.0f}s"
+            for mac, (state, interval) in self.playerInterval.items()
+        )
+        self.debug_log(f"Poll rates: {rates}")
+
+    # ------------------------------------------------------------------
+    # CLI EVENTS
+    # ------------------------------------------------------------------
+    def process_events(self):
+        if not self.listener:
+            return
+
+        now = time.time()
+        connected = self.listener.connected
+        if connected and not self.listenerWasConnected:
+            # Events may have been missed while disconnected: resync the
+            # server and every player once
+            self.nextPoll = now
+            self.playerNextPoll = {}
+        elif not connected and self.nextPoll > now + self.pollInterval:
+            # Stream lost: fall back to normal polling
+            self.nextPoll = now + self.pollInterval
+        self.listenerWasConnected = connected
+
+        dirty = set()
+        while True:
+            try:
+                mac, tokens = self.events.get_nowait()
+            except queue.Empty:
+                break
+            self.debug_log(f"CLI event {mac}: {' '.join(tokens)}")
+            if tokens[0] == "client":
+                # new / disconnect / reconnect / forget: rediscover players
+                self.discoveryNeeded = True
+                self.nextPoll = now
+            else:
+                dirty.add(mac)
+
+        # Also when a server cycle is due: it does not read the players
+        for mac in dirty:
+            self.request_refresh(mac)
+
+    # ------------------------------------------------------------------
+    # SINGLE-PLAYER REFRESH
+    # ------------------------------------------------------------------
+    def find_player(self, mac):
+        return next((p for p in self.players if p.get("playerid") == mac), None)
+
+    def request_refresh(self, mac, delay=0.0):
+        """Re-read only this player's status after `delay` seconds."""
+        due = time.time() + delay
+        self.refreshDue[mac] = max(self.refreshDue.get(mac, 0), due)
+
+    def process_refreshes(self):
+        now = time.time()
+        for mac, due in list(self.refreshDue.items()):
+            if due > now or mac in self.refreshing:
+                continue
+            if self.command_pending(mac):
+                # Wait until the command itself has been sent
+                continue
+            del self.refreshDue[mac]
+            if self.find_player(mac) is None:
+                # Unknown player: let a full poll discover it
+                self.discoveryNeeded = True
+                self.nextPoll = now
+                continue
+            self.debug_log(f"Refreshing player {mac}")
+            self.refreshing.add(mac)
+            self.submit_task(self.fetch_player_task(mac), lambda st, mac=mac: self.refresh_done(mac, st))
+
+    def refresh_done(self, mac, st):
+        self.refreshing.discard(mac)
+        player = self.find_player(mac)
+        if player is not None and st:
+            self.apply_player(player, st, throttle=False)
+            self.schedule_player(mac, st)
+            self.update_group_devices()
+
+    # ------------------------------------------------------------------
+    # QUERY TASKS
+    # ------------------------------------------------------------------
+    # Network work is written as generators: they yield (player, cmd_array)
+    # for one query, or a Gather of sub-tasks to run concurrently, and get
+    # the result back from the yield. run_task drives them with blocking
+    # requests; with the native transport start_task drives them from the
+    # connection callbacks. Devices are only touched in the done() callbacks.
+    def run_task(self, task):
+        """Blocking driver. Gathers fan out over the executor, so only the
+        Domoticz thread may run tasks that gather."""
+        result = None
+        while True:
+            try:
+                step = task.send(result)
+            except StopIteration as stop:
+                return stop.value
+            if isinstance(step, Gather):
+                if self.executor and len(step) > 1:
+                    result = list(self.executor.map(self.run_task, step))
+                else:
+                    result = [self.run_task(sub) for sub in step]
+            else:
+                result = self.lms_query_raw(*step)
+
+    def start_task(self, task, done, result=None):
+        """Native driver: advance `task` until its next query is sent."""
         try:
-            r = requests.post(self.url, json=data, auth=self.auth, timeout=10)
-            r.raise_for_status()
-            result = r.json().get("result")
+            step = task.send(result)
+        except StopIteration as stop:
+            done(stop.value)
+            return
+        except Exception as e:
+            self.error(f"LMS query task failed: {e}")
+            done(None)
+            return
+
+        if isinstance(step, Gather):
+            if not step:
+                self.start_task(task, done, [])
+                return
+            results = [None] * len(step)
+            remaining = [len(step)]
+
+            def collect(index):
+                def store(value):
+                    results[index] = value
+                    remaining[0] -= 1
+                    if remaining[0] == 0:
+                        self.start_task(task, done, results)
+                return store
+
+            for index, sub in enumerate(step):
+                self.start_task(sub, collect(index))
+        else:
+            self.lms_query_async(*step, lambda value: self.start_task(task, done, value))
+
+    def run_then(self, task, done):
+        """Run a task now: blocking with requests, in the background with
+        the native transport or on the cycle thread when there are several
+        servers. done(result) runs on the Domoticz thread."""
+        if self.native or self.backgroundCycle:
+            self.run_in_cycle(task, done)
+        else:
+            done(self.run_task(task))
 
-            self.last_success = time.time()
+    def run_in_cycle(self, task, done):
+        """Run a task in the background, on the cycle thread (with the native
+        transport without threads); done(result) runs on the Domoticz thread."""
+        if self.native:
+            self.start_task(task, done)
+        else:
+            self.taskFutures.append((self.cycleExecutor.submit(self.run_task, task), done))
+
+    def submit_task(self, task, done):
+        """Run a task in the background (worker thread or native transport)."""
+        if self.native:
+            self.start_task(task, done)
+        else:
+            self.taskFutures.append((self.executor.submit(self.run_task, task), done))
 
-            if self.server_was_online is not True:
-                if self.server_was_online is False:
-                    self.log("Lyrion Music Server is back ONLINE.")
-                self.server_was_online = True
+    def process_tasks(self):
+        """Hand finished worker-thread tasks to their done() callbacks."""
+        if not self.taskFutures:
+            return
+        finished = [(future, done) for future, done in self.taskFutures if future.done()]
+        self.taskFutures = [(future, done) for future, done in self.taskFutures if not future.done()]
+        for future, done in finished:
+            done(future.result())
+
+    def submit_all(self, tasks, done):
+        """Run tasks concurrently in the background; done(results) gets
+        their results in order once the last one has finished."""
+        if not tasks:
+            done([])
+            return
+        results = [None] * len(tasks)
+        remaining = [len(tasks)]
 
-            return result
+        def collect(index):
+            def store(value):
+                results[index] = value
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done(results)
+            return store
 
+        for index, task in enumerate(tasks):
+            self.submit_task(task, collect(index))
+
+    @staticmethod
+    def gather_task(tasks):
+        return (yield Gather(tasks))
+
+    @staticmethod
+    def command_task(playerid, cmd_array):
+        return (yield playerid, cmd_array)
+
+    # ------------------------------------------------------------------
+    # LMS JSON helper
+    # ------------------------------------------------------------------
+    @staticmethod
+    def lms_request(player, cmd_array):
+        return {"id": 1, "method": "slim.request", "params": [player, cmd_array]}
+
+    def lms_query_raw(self, player, cmd_array):
+        if self.breaker.is_open:
+            # Fail fast while the server is offline; one caller at a time
+            # gets to send the cheap probe once the backoff has expired.
+            if not self.breaker.claim_probe() or not self.probe_server():
+                return None
+
+        kind = self.request_kind(cmd_array)
+        start = time.time()
+        try:
+            result = self.transport.post(self.lms_request(player, cmd_array)).get("result")
         except Exception as e:
-            now = time.time()
+            self.metrics.request(kind, time.time() - start, error=e, timeout=self.is_timeout(e))
+            if self.recorder:
+                self.recorder.write(player, cmd_array, start, time.time() - start, error=e)
+            self.query_failed(e)
+            return None
+        self.metrics.request(kind, time.time() - start)
+        if self.recorder:
+            self.recorder.write(player, cmd_array, start, time.time() - start, result=result)
+        self.query_succeeded()
+        return result
+
+    def lms_query_async(self, player, cmd_array, callback):
+        """Native transport: like lms_query_raw, the result goes to callback()."""
+        if self.breaker.is_open:
+            # The probe is sent from onHeartbeat
+            callback(None)
+            return
+
+        kind = self.request_kind(cmd_array)
+        start = time.time()
+
+        def on_reply(reply, error):
+            self.metrics.request(kind, time.time() - start, error=error, timeout=self.is_timeout(error))
+            if self.recorder:
+                self.recorder.write(player, cmd_array, start, time.time() - start,
+                                    result=reply.get("result") if error is None else None, error=error)
+            if error is not None:
+                self.query_failed(error)
+                callback(None)
+                return
+            self.query_succeeded()
+            callback(reply.get("result"))
 
-            # pas offline melden als grace period verstreken is
-            if self.server_was_online is not False:
-                if now - self.last_success > self.offline_grace:
-                    self.log("Lyrion Music Server is OFFLINE")
-                    self.server_was_online = False
+        self.transport.send(self.lms_request(player, cmd_array), on_reply)
 
-            self.debug_log(f"LMS query failed: {e}")
+    def open_replay(self, record_file):
+        """ReplayTransport for transport=replay, None when the recording
+        cannot be read. A relative 'replay' path is in the plugin folder."""
+        path = os.path.join(Parameters.get("HomeFolder", ""), self.options.get("replay") or record_file)
+        try:
+            transport = ReplayTransport(path, speed=max(0.0, self.option_float("replay_speed", 1)),
+                                        debug_log=self.debug_log)
+        except OSError as e:
+            self.error(f"Unable to open recording for replay ({e}), using requests")
             return None
+        self.log(f"Replaying LMS traffic from {path} (speed {transport.speed:g})")
+        return transport
+
+    @staticmethod
+    def request_kind(cmd_array):
+        """Metrics key of a request: its command ('status', 'mixer', ...)."""
+        return str(cmd_array[0]) if cmd_array else "?"
+
+    @staticmethod
+    def is_timeout(error):
+        return isinstance(error, (requests.exceptions.Timeout, TimeoutError, socket.timeout))
+
+    def query_succeeded(self):
+        self.last_success = time.time()
+
+        if self.server_was_online is not True:
+            if self.server_was_online is False:
+                self.log("Lyrion Music Server is back ONLINE.")
+            self.server_was_online = True
 
-    def get_serverstatus(self):
-        return self.lms_query_raw("", ["serverstatus", 0, 999])
+    def query_failed(self, e):
+        now = time.time()
 
-    def get_status(self, playerid):
-        return self.lms_query_raw(playerid, ["status", "-", 1, "tags:adclmntyK"])
+        # pas offline melden als grace period verstreken is
+        if self.server_was_online is not False:
+            if now - self.last_success > self.offline_grace:
+                self.log("Lyrion Music Server is OFFLINE")
+                self.server_was_online = False
+                self.breaker.open()
+
+        self.debug_log(f"LMS query failed: {e}")
+
+    def probe_server(self):
+        """Cheap short-timeout request used while the circuit is open."""
+        try:
+            self.transport.post(self.lms_request("", ["serverstatus", 0, 0]), timeout=self.breaker.probe_timeout)
+        except Exception as e:
+            return self.probe_done(e)
+        return self.probe_done(None)
+
+    def probe_server_async(self):
+        self.transport.send(self.lms_request("", ["serverstatus", 0, 0]),
+                            lambda reply, error: self.probe_done(error),
+                            timeout=self.breaker.probe_timeout)
+
+    def probe_done(self, error):
+        if error is not None:
+            delay = self.breaker.probe_failed()
+            self.debug_log(f"LMS probe failed ({error}), next probe in {delay:.0f}s")
+            return False
+
+        self.breaker.close()
+        self.last_success = time.time()
+        self.server_was_online = True
+        self.log("Lyrion Music Server is back ONLINE.")
+
+        # Full resync: server cycle and every player on the next heartbeat
+        self.nextPoll = time.time()
+        self.playerNextPoll = {}
+        return True
 
     def send_playercmd(self, playerid, cmd_array):
-        return self.lms_query_raw(playerid, cmd_array)
+        """Queue a player command; it is sent by the background dispatcher."""
+        if self.dispatcher is None:
+            return self.lms_query_raw(playerid, cmd_array)
+        self.dispatcher.submit(playerid, cmd_array)
+        if self.native:
+            self.pump_commands()
+        self.request_refresh(playerid, self.refreshDelay)
+        return None
+
+    def pump_commands(self):
+        """Native transport: send the next queued command once the previous
+        one is answered, so commands keep their order like the dispatcher."""
+        if self.commandInFlight is not None:
+            return
+        command = self.dispatcher.take()
+        if command is None:
+            return
+        playerid, cmd_array = command
+        self.commandInFlight = command
+        start = time.time()
+
+        def sent(result):
+            self.commandInFlight = None
+            self.commandResults.put((playerid, cmd_array, result is not None, time.time() - start))
+            self.pump_commands()
+
+        self.lms_query_async(playerid, cmd_array, sent)
+
+    def send_batch(self, commands, done=None, refresh=True):
+        """Send [(playerid, cmd_array), ...] concurrently, past the dispatcher
+        queue: one slow or offline player does not hold up the others.
+        done([ok, ...]) runs on the Domoticz thread when all are answered.
+        With refresh=False the caller re-reads the players itself."""
+        start = time.time()
+
+        def finished(results):
+            oks = [result is not None for result in results]
+            self.debug_log(f"Batch of {len(commands)} command(s) done in {time.time() - start:.2f}s, {oks.count(False)} failed")
+            if refresh:
+                for playerid, _ in commands:
+                    self.request_refresh(playerid, self.refreshDelay)
+            if done:
+                done(oks)
+
+        self.submit_all([self.command_task(playerid, cmd_array) for playerid, cmd_array in commands], finished)
+
+    def command_pending(self, playerid):
+        """True while a command for this player still has to be sent."""
+        if self.commandInFlight is not None and self.commandInFlight[0] == playerid:
+            return True
+        return bool(self.dispatcher and self.dispatcher.has_pending(playerid))
+
+    def process_command_results(self):
+        while True:
+            try:
+                playerid, cmd_array, ok, elapsed = self.commandResults.get_nowait()
+            except queue.Empty:
+                break
+            cmd = " ".join(str(c) for c in cmd_array)
+            if ok:
+                self.debug_log(f"Command '{cmd}' for {playerid} sent in {elapsed:.2f}s")
+            else:
+                self.error(f"Command '{cmd}' for {playerid} failed after {elapsed:.1f}s")
 
     def send_button(self, playerid, button):
         return self.send_playercmd(playerid, ["button", button])
@@ -229,14 +1817,187 @@ class LMSPlugin:
         self.send_playercmd(playerid, cmd)
         self.log(f"Display text sent to {playerid}: '{line1}' / '{line2}' ({d}s)")
 
+    # ------------------------------------------------------------------
+    # STATE SNAPSHOT (warm start)
+    # ------------------------------------------------------------------
+    def save_snapshot(self):
+        # Poll and refresh tasks add to trackMeta from worker threads: dump
+        # copies (dict.copy is atomic), not the live dicts
+        catalog = self.catalog
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "saved": time.time(),
+            "players": self.players,
+            "units": self.playerUnits,
+            "group_units": self.groupUnits,
+            "progress_players": sorted(self.progressPlayers),
+            "catalog": {
+                "key": catalog.key,
+                "count": catalog.count,
+                "page_size": catalog.page_size,
+                "pages": {str(page): playlists for page, playlists in catalog.pages.items()},
+            } if catalog.loaded else None,
+            "playlist_page": self.playlistPage,
+            "status": self.lastStatus.copy(),
+            "track_meta": self.trackMeta.copy(),
+        }
+        tmp = self.snapshotFile + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp, self.snapshotFile)
+            self.debug_log(f"Snapshot saved to {self.snapshotFile}")
+        except (OSError, TypeError, ValueError) as e:
+            self.error(f"Unable to save snapshot: {e}")
+
+    def load_snapshot(self):
+        """Restore players, device map, playlists and player state saved by
+        save_snapshot: the first polls are spread like later ones and only
+        write what changed.
+
+        The device index is always valid afterwards: if the saved unit map
+        no longer matches Devices, Devices is scanned instead.
+        """
+        start = time.time()
+        try:
+            with open(self.snapshotFile, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            self.build_device_index()
+            return False
+        except (OSError, ValueError) as e:
+            self.error(f"Ignoring unreadable snapshot: {e}")
+            self.build_device_index()
+            return False
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            self.build_device_index()
+            return False
+
+        units = snapshot.get("units") or {}
+        group_units = snapshot.get("group_units")
+        if units and group_units is not None and all(
+            u is None or (u in Devices and Devices[u].Description == self.device_description(key))
+            for key, unit_list in list(units.items()) + [(GROUP_PREFIX + n, g) for n, g in group_units.items()]
+            for u in unit_list
+        ):
+            self.playerUnits = {}
+            self.unitIndex = {}
+            self.groupUnits = {}
+            self.groupIndex = {}
+            for mac, unit_list in units.items():
+                self.index_player(mac, {role: u for role, u in zip(PLAYER_ROLES, unit_list) if u is not None})
+            for name, unit_list in group_units.items():
+                self.index_group(name, {role: u for role, u in zip(GROUP_ROLES, unit_list) if u is not None})
+        else:
+            self.build_device_index()
+
+        self.players = snapshot.get("players") or []
+        self.progressPlayers.update(snapshot.get("progress_players") or [])
+        self.lastStatus = snapshot.get("status") or {}
+        self.playlistPage = snapshot.get("playlist_page") or {}
+        self.trackMeta = {
+            mac: (tuple(key), meta, fetched)
+            for mac, (key, meta, fetched) in (snapshot.get("track_meta") or {}).items()
+        }
+
+        # What the devices show and when each player is due, as at the save:
+        # the first polls are spread and only write what changed since then
+        age = max(0.0, time.time() - snapshot.get("saved", time.time()))
+        for mac, st in self.lastStatus.items():
+            if mac not in self.playerUnits or self.find_player(mac) is None:
+                continue
+            state = self.playerState[mac] = PlayerState.from_status(st)
+            self.syncGroups.update(mac, state.sync_master, state.sync_slaves)
+            self.schedule_player(mac, st)
+            self.playerNextPoll[mac] -= age
+
+        cat = snapshot.get("catalog")
+        if cat and cat.get("page_size") == self.catalog.page_size and cat.get("key"):
+            self.catalog.reset(tuple(cat["key"]), cat.get("count", 0))
+            for page, playlists in sorted(cat.get("pages", {}).items(), key=lambda item: int(item[0])):
+                self.catalog.set_page(int(page), playlists)
+
+        self.log(
+            f"Snapshot loaded in {(time.time() - start) * 1000:.1f} ms: {len(self.players)} player(s), "
+            f"{len(self.catalog.playlists)} playlist(s), saved {age / 60:.0f} min ago"
+        )
+        return True
+
+    # ------------------------------------------------------------------
+    # DEVICE WRITES
+    # ------------------------------------------------------------------
+    def update_device(self, unit, nValue, sValue, Options=None, throttle=False):
+        """Single write path for all devices.
+
+        Writes are skipped when the value equals the last one written, so
+        Devices does not have to be re-read. With throttle=True a unit is
+        written at most once per writeInterval; the newest value waits in
+        pendingWrites. Returns True when the value is (or will be) written.
+        """
+        if unit not in Devices:
+            return False
+
+        value = (nValue, sValue)
+        last = self.deviceCache.get(unit)
+        if last is None:
+            dev = Devices[unit]
+            last = self.deviceCache[unit] = (dev.nValue, dev.sValue)
+
+        if Options is None and value == last:
+            self.pendingWrites.pop(unit, None)
+            self.writeStats["skipped"] += 1
+            return False
+
+        if throttle and Options is None:
+            if time.time() - self.lastWriteTime.get(unit, 0) < self.writeInterval:
+                self.pendingWrites[unit] = value
+                self.writeStats["throttled"] += 1
+                return True
+
+        self._write_device(unit, nValue, sValue, Options)
+        return True
+
+    def _write_device(self, unit, nValue, sValue, Options=None):
+        if Options is None:
+            Devices[unit].Update(nValue=nValue, sValue=sValue)
+        else:
+            Devices[unit].Update(nValue=nValue, sValue=sValue, Options=Options)
+        self.deviceCache[unit] = (nValue, sValue)
+        self.lastWriteTime[unit] = time.time()
+        self.pendingWrites.pop(unit, None)
+        self.writeStats["written"] += 1
+
+    def flush_pending_writes(self):
+        if not self.pendingWrites:
+            return
+        now = time.time()
+        for unit, (nValue, sValue) in list(self.pendingWrites.items()):
+            if unit not in Devices:
+                del self.pendingWrites[unit]
+            elif now - self.lastWriteTime.get(unit, 0) >= self.writeInterval:
+                self._write_device(unit, nValue, sValue)
+
+    def log_write_stats(self):
+        stats = self.writeStats
+        self.metrics.device_writes(stats["written"])
+        self.debug_log(
+            f"Device writes this cycle: {stats['written']} written, {stats['skipped']} unchanged, "
+            f"{stats['throttled']} throttled, {len(self.pendingWrites)} pending"
+        )
+        self.writeStats = {"written": 0, "skipped": 0, "throttled": 0}
+
     # ------------------------------------------------------------------
     # DEVICE CREATION / LOOKUP
     # ------------------------------------------------------------------
     def create_player_devices(self, name, mac):
-        base = name
+        base = f"{self.namespace} {name}" if self.namespace else name
         unit = 1
-        while unit in Devices:
+        while any(u in Devices for u in range(unit, unit + len(PLAYER_ROLES))):
             unit += 10
+        if unit + len(PLAYER_ROLES) - 1 > MAX_UNIT:
+            self.error(f"No free units left for player '{name}' (Domoticz allows units up to {MAX_UNIT})")
+            return None
 
         # main selector
         opts_main = {
@@ -252,7 +2013,7 @@ class LMSPlugin:
             Switchtype=18,
             Options=opts_main,
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
@@ -262,7 +2023,7 @@ class LMSPlugin:
             Unit=unit + 1,
             TypeName="Dimmer",
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
@@ -272,7 +2033,7 @@ class LMSPlugin:
             Unit=unit + 2,
             TypeName="Text",
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
@@ -290,7 +2051,7 @@ class LMSPlugin:
             Switchtype=18,
             Options=opts_act,
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
@@ -308,7 +2069,7 @@ class LMSPlugin:
             Switchtype=18,
             Options=opts_shuffle,
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
@@ -326,7 +2087,7 @@ class LMSPlugin:
             Switchtype=18,
             Options=opts_repeat,
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
@@ -344,90 +2105,278 @@ class LMSPlugin:
             Switchtype=18,
             Options=opts_pl,
             Image=self.imageID,
-            Description=mac,
+            Description=self.device_description(mac),
             Used=1,
         ).Create()
 
         self.createdDevices += 7
+        self.playerState.pop(mac, None)
         self.log(f"Devices created for player '{name}'")
-        return (unit, unit + 1, unit + 2, unit + 3, unit + 4, unit + 5, unit + 6)
+        units = (unit, unit + 1, unit + 2, unit + 3, unit + 4, unit + 5, unit + 6)
+        self.index_player(mac, dict(zip(PLAYER_ROLES, units)))
+        self.create_progress_device(name, mac)
+        return self.playerUnits[mac]
+
+    def create_progress_device(self, name, mac):
+        """Progress text device at main unit + 7; also added to players
+        created by older versions of the plugin, but not to players whose
+        Progress device was deleted."""
+        units = self.playerUnits.get(mac)
+        if not units or not self.progressInterval:
+            return
+        unit = units[0] + PLAYER_ROLES.index("progress")
+        if unit in Devices:
+            unit = next((u for u in range(1, MAX_UNIT + 1) if u not in Devices), None)
+            if unit is None:
+                self.error(f"No free unit for the Progress device of '{name}'")
+                return
 
-    def find_player_devices(self, mac):
-        main = vol = text = actions = shuffle = repeat = playlistsel = None
+        base = f"{self.namespace} {name}" if self.namespace else name
+        Domoticz.Device(
+            Name=f"{base} Progress",
+            Unit=unit,
+            TypeName="Text",
+            Image=self.imageID,
+            Description=self.device_description(mac),
+            Used=1,
+        ).Create()
 
+        self.createdDevices += 1
+        roles = {role: u for role, u in zip(PLAYER_ROLES, units) if u is not None}
+        roles["progress"] = unit
+        self.index_player(mac, roles)
+        self.debug_log(f"Progress device created for player '{name}' (unit {unit})")
+
+    def build_device_index(self):
+        """Scan Devices once and index the player and group devices by mac
+        (group name) and unit."""
+        self.playerUnits = {}
+        self.unitIndex = {}
+        self.groupUnits = {}
+        self.groupIndex = {}
+
+        roles_by_mac = {}
+        roles_by_group = {}
         for uid, dev in Devices.items():
-            if dev.Description != mac:
+            mac = self.description_mac(dev.Description)
+            if not mac:
                 continue
+            if mac.startswith((METRICS_PREFIX, CONTROL_PREFIX)):
+                # Indexed by create_metric_devices / create_profile_device
+                continue
+            if mac.startswith(GROUP_PREFIX):
+                roles_by_group.setdefault(mac[len(GROUP_PREFIX):], {})[self.group_role(dev.Name)] = uid
+                continue
+            roles_by_mac.setdefault(mac, {})[self.device_role(dev.Name)] = uid
+
+        for mac, roles in roles_by_mac.items():
+            self.index_player(mac, roles)
+        for name, roles in roles_by_group.items():
+            self.index_group(name, roles)
+        self.debug_log(
+            f"Device index built: {len(self.playerUnits)} player(s), {len(self.groupUnits)} group(s), "
+            f"{len(self.unitIndex) + len(self.groupIndex)} device(s)"
+        )
+
+    def index_player(self, mac, roles):
+        for role, uid in roles.items():
+            self.unitIndex[uid] = (mac, role)
+        if "main" in roles:
+            self.playerUnits[mac] = tuple(roles.get(role) for role in PLAYER_ROLES)
+        if "progress" in roles:
+            self.progressPlayers.add(mac)
 
-            if dev.Name.endswith("Volume"):
-                vol = uid
-            elif dev.Name.endswith("Track"):
-                text = uid
-            elif dev.Name.endswith("Actions"):
-                actions = uid
-            elif dev.Name.endswith("Shuffle"):
-                shuffle = uid
-            elif dev.Name.endswith("Repeat"):
-                repeat = uid
-            elif dev.Name.endswith("Playlists"):
-                playlistsel = uid
-            else:
-                main = uid
+    def find_player_devices(self, mac):
+        return self.playerUnits.get(mac)
 
-        if main:
-            return (main, vol, text, actions, shuffle, repeat, playlistsel)
-        return None
+    def create_metric_devices(self):
+        """Custom sensors for the metrics summary; existing ones are found by
+        their Description, missing ones are created."""
+        self.metricUnits = {}
+        for uid, dev in Devices.items():
+            key = self.description_mac(dev.Description)
+            if key and key.startswith(METRICS_PREFIX):
+                self.metricUnits[key[len(METRICS_PREFIX):]] = uid
+
+        base = f"{self.namespace} " if self.namespace else ""
+        for key, label, axis in METRIC_DEVICES:
+            if key in self.metricUnits:
+                continue
+            unit = next((u for u in range(MAX_UNIT, 0, -1) if u not in Devices), None)
+            if unit is None:
+                self.error(f"No free unit for the '{label}' metrics device")
+                return
+            Domoticz.Device(
+                Name=f"{base}Lyrion {label}",
+                Unit=unit,
+                TypeName="Custom",
+                Options={"Custom": f"1;{axis}"},
+                Description=self.device_description(METRICS_PREFIX + key),
+                Used=1,
+            ).Create()
+            self.metricUnits[key] = unit
+            self.createdDevices += 1
+            self.debug_log(f"Metrics device '{label}' created (unit {unit})")
+
+    def create_profile_device(self):
+        """Hidden switch ('$' name) that starts a profiling run."""
+        description = self.device_description(CONTROL_PREFIX + "profiling")
+        self.profileUnit = next((uid for uid, dev in Devices.items() if dev.Description == description), None)
+        if self.profileUnit is not None:
+            return
+        unit = next((u for u in range(MAX_UNIT, 0, -1) if u not in Devices), None)
+        if unit is None:
+            self.error("No free unit for the profiling switch")
+            return
+        base = f"{self.namespace} " if self.namespace else ""
+        Domoticz.Device(
+            Name=f"${base}Lyrion Profiling",
+            Unit=unit,
+            TypeName="Switch",
+            Description=description,
+            Used=1,
+        ).Create()
+        self.profileUnit = unit
+        self.createdDevices += 1
+        self.debug_log(f"Profiling switch created (unit {unit})")
+
+    def index_group(self, name, roles):
+        for role, uid in roles.items():
+            self.groupIndex[uid] = (name, role)
+        if "control" in roles:
+            self.groupUnits[name] = tuple(roles.get(role) for role in GROUP_ROLES)
+
+    def create_group_devices(self, name):
+        """Control (power), Volume and Pause for a group, in the highest free
+        block of units so they stay clear of the player blocks."""
+        base = f"{self.namespace} {name}" if self.namespace else name
+        size = len(GROUP_ROLES)
+        unit = MAX_UNIT - size + 1
+        while unit >= 1 and any(u in Devices for u in range(unit, unit + size)):
+            unit -= size
+        if unit < 1:
+            self.error(f"No free units left for group '{name}' (Domoticz allows units up to {MAX_UNIT})")
+            return None
+
+        description = self.device_description(GROUP_PREFIX + name)
+        for offset, (suffix, type_name) in enumerate((("Control", "Switch"), ("Volume", "Dimmer"), ("Pause", "Switch"))):
+            Domoticz.Device(
+                Name=f"{base} {suffix}",
+                Unit=unit + offset,
+                TypeName=type_name,
+                Image=self.imageID,
+                Description=description,
+                Used=1,
+            ).Create()
+
+        self.createdDevices += size
+        self.log(f"Devices created for group '{name}'")
+        self.index_group(name, dict(zip(GROUP_ROLES, range(unit, unit + size))))
+        return self.groupUnits[name]
 
     # ------------------------------------------------------------------
-    # PLAYER-SPECIFIC PLAYLISTS
+    # PLAYLISTS (server-wide catalog, shared by all players)
     # ------------------------------------------------------------------
-    def get_player_playlists(self, mac):
-        result = self.send_playercmd(mac, ["playlists", 0, self.max_playlists])
-        if not result:
+    def fetch_playlist_page_task(self, page):
+        start = page * self.catalog.page_size
+        count = max(0, min(self.catalog.page_size, self.max_playlists - start))
+        if not count:
             return []
+        result = yield "", ["playlists", start, count]
+        if not result:
+            return None
 
         pl_loop = result.get("playlists_loop", []) or []
         playlists = []
-        for p in pl_loop[: self.max_playlists]:
+        for p in pl_loop[:count]:
             name = p.get("playlist", "")
             plid = p.get("id")
             if name:
                 playlists.append({"id": plid, "playlist": name})
         return playlists
 
-    def update_player_playlist_selector(self, plsel_unit, playlists, active_playlist_name=None):
-        if plsel_unit not in Devices:
+    def refresh_playlist_catalog(self, server, probe):
+        """Restart paged loading only when a rescan or the playlist count says so."""
+        count = int(probe.get("count", 0) or 0)
+        key = (server.get("lastscan"), count)
+        if self.catalog.loaded and key == self.catalog.key:
             return
 
-        dev_pl = Devices[plsel_unit]
+        self.catalog.reset(key, min(count, self.max_playlists))
+        self.debug_log(f"Playlist catalog changed: {count} playlist(s) in {self.catalog.page_count} page(s), key={key}")
 
-        if not playlists:
-            levelnames = "Select|No playlists"
-        else:
-            levelnames = "Select|" + "|".join(p["playlist"] for p in playlists)
+    def process_playlist_pages(self):
+        """Load one catalog page at a time, pages that players are looking
+        at first. A page of an outdated catalog is dropped when it arrives."""
+        if self.playlistPageLoading is not None or not self.catalog.loaded:
+            return
+        missing = self.catalog.missing_pages()
+        if not missing:
+            return
+        wanted = [page for page in missing if page in self.playlistPageRequests]
+        page = wanted[0] if wanted else missing[0]
+        self.playlistPageLoading = (page, self.catalog.key)
+        self.submit_task(self.fetch_playlist_page_task(page), self.playlist_page_done)
+
+    def playlist_page_done(self, playlists):
+        page, key = self.playlistPageLoading
+        self.playlistPageLoading = None
+        if playlists is None or key != self.catalog.key:
+            return
+        self.catalog.set_page(page, playlists)
+        self.playlistPageRequests.discard(page)
+        self.debug_log(f"Playlist page {page + 1}/{self.catalog.page_count} loaded ({len(playlists)} playlist(s))")
+        self.refresh_playlist_selectors()
 
-        opts = {
-            "LevelNames": levelnames,
-            "LevelActions": "",
-            "SelectorStyle": "1",
-        }
+    def refresh_playlist_selectors(self):
+        for mac, units in self.playerUnits.items():
+            plsel = units[PLAYER_ROLES.index("playlists")]
+            self.update_player_playlist_selector(plsel, self.playlistActive.get(mac))
+
+    def update_player_playlist_selector(self, plsel_unit, active_playlist_name=None):
+        if plsel_unit not in Devices:
+            return
+
+        dev_pl = Devices[plsel_unit]
+        mac = self.unitIndex.get(plsel_unit, (self.description_mac(dev_pl.Description), None))[0]
+        self.playlistActive[mac] = active_playlist_name
+        page = self.playlistPage.get(mac, 0)
+        if page >= self.catalog.page_count:
+            page = self.playlistPage[mac] = 0
+        levelnames = self.catalog.level_names(page)
 
         if dev_pl.Options.get("LevelNames", "") != levelnames:
-            dev_pl.Update(nValue=0, sValue=dev_pl.sValue, Options=opts)
+            opts = {
+                "LevelNames": levelnames,
+                "LevelActions": "",
+                "SelectorStyle": "1",
+            }
+            self.update_device(plsel_unit, 0, dev_pl.sValue, Options=opts)
             dev_pl = Devices[plsel_unit]
             self.log(f"Playlist selector updated for '{dev_pl.Name}'.")
 
-        if active_playlist_name and playlists:
-            for idx, pinfo in enumerate(playlists):
-                if pinfo["playlist"] == active_playlist_name:
-                    expected_level = (idx + 1) * 10
-                    if dev_pl.sValue != str(expected_level):
-                        self.log(f"Setting playlist selector '{dev_pl.Name}' to level {expected_level} for '{active_playlist_name}'")
-                        dev_pl.Update(nValue=0, sValue=str(expected_level))
-                    break
-        else:
-            if dev_pl.sValue != "0":
-                dev_pl.Update(nValue=0, sValue="0")
+        location = self.catalog.level_by_name.get(active_playlist_name) if active_playlist_name else None
+        if location and location[0] == page:
+            expected_level = location[1]
+            if self.update_device(plsel_unit, 0, str(expected_level)):
+                self.log(f"Setting playlist selector '{dev_pl.Name}' to level {expected_level} for '{active_playlist_name}'")
+        elif not active_playlist_name:
+            self.update_device(plsel_unit, 0, "0")
+
+    def handle_playlist_selector(self, dev, mac, Level):
+        """Playlist selector: load a playlist or move to another page."""
+        page = self.playlistPage.get(mac, 0)
+        entry = self.catalog.entry_for_level(page, int(Level // 10) * 10)
+        if entry and entry[0] in ("prev", "next"):
+            page = max(0, min(page + (1 if entry[0] == "next" else -1), self.catalog.page_count - 1))
+            self.playlistPage[mac] = page
+            if page not in self.catalog.pages:
+                self.playlistPageRequests.add(page)
+            self.update_device(dev.Unit, 0, "0")
+            self.update_player_playlist_selector(dev.Unit, self.playlistActive.get(mac))
+            self.log_player(dev, f"Playlists page {page + 1}/{self.catalog.page_count}")
+            return
+        self.play_playlist_for_player(mac, Level)
 
     def play_playlist_for_player(self, mac, Level):
         if Level == 0:
@@ -437,166 +2386,75 @@ class LMSPlugin:
         if Level < 10:
             return
 
-        playlists = self.get_player_playlists(mac)
-        idx = int(Level // 10) - 1
-        if idx < 0 or idx >= len(playlists):
+        entry = self.catalog.entry_for_level(self.playlistPage.get(mac, 0), int(Level // 10) * 10)
+        if not entry or entry[0] != "playlist":
             self.error("Invalid playlist index.")
             return
 
-        pl = playlists[idx]
+        pl = entry[1]
         playlist_name = pl["playlist"]
         playlist_id = pl["id"]
 
         self.send_playercmd(mac, ["playlistcontrol", "cmd:load", f"playlist_id:{playlist_id}"])
         self.log(f"Loaded playlist '{playlist_name}' (ID {playlist_id}) on player {mac}")
-        self.nextPoll = time.time() + 1
 
     # ------------------------------------------------------------------
     # MAIN UPDATE LOOP
     # ------------------------------------------------------------------
     def updateEverything(self):
-        server = self.get_serverstatus()
+        if self.cycleRunning:
+            # The previous cycle is still waiting for replies
+            return
+        self.cycleRunning = True
+        self.cycleStart = time.time()
+        # Never blocking: with a slow server the cycle's requests would not
+        # fit in the heartbeat budget
+        self.run_in_cycle(self.server_cycle_task(), self.server_cycle_done)
+
+    def server_cycle_task(self):
+        # Without players_loop: only the counters and lastscan
+        server = yield "", ["serverstatus", 0, 0]
         if not server:
             # Geen extra log hier meer – melding komt al uit lms_query_raw
-            return
-
-        self.players = server.get("players_loop", []) or []
-
-        for p in self.players:
-            name = p.get("name", "Unknown")
-            mac = p.get("playerid", "")
-            if mac and not self.find_player_devices(mac):
-                self.create_player_devices(name, mac)
-
-        for p in self.players:
-            mac = p.get("playerid")
-            if not mac:
-                continue
-
-            devices = self.find_player_devices(mac)
-            if not devices:
-                continue
-
-            main, vol, text, actions, shuffle, repeat, plsel = devices
-            st = self.get_status(mac) or {}
-
-            power = int(st.get("power", 0))
-            mode = st.get("mode", "stop")
-
-            sel_level = {"pause": 10, "play": 20, "stop": 30}.get(mode, 0)
-            if power == 0:
-                sel_level = 0
-
-            if main in Devices:
-                dev_main = Devices[main]
-                n = 1 if power else 0
-                s = str(sel_level)
-                if dev_main.nValue != n or dev_main.sValue != s:
-                    dev_main.Update(nValue=n, sValue=s)
-
-            if vol in Devices:
-                dev_vol = Devices[vol]
-                raw = st.get("mixer volume", 0)
-                try:
-                    new = int(float(str(raw).replace("%", "")))
-                except:
-                    new = 0
-
-                # Log de waarde (dat werkte al)
-                Domoticz.Debug(f"LMS Player '{p.get('name')}' - Volume: {new}%")
-
-                # FORCEER UPDATE: 
-                # We gebruiken nValue=2 (Set Level) in plaats van 1 (On).
-                # Dit dwingt Domoticz om de sValue (het getal) te tonen op de tegel.
-                # We vergelijken ook of de sValue al klopt, om onnodige database writes te voorkomen.
-                if dev_vol.sValue != str(new) or dev_vol.nValue != (2 if new > 0 else 0):
-                    dev_vol.Update(nValue=2 if new > 0 else 0, sValue=str(new))
-
-            if text in Devices:
-                dev_text = Devices[text]
-
-                if power == 0 or mode in ["stop", "pause"]:
-                    if dev_text.sValue != " ":
-                        dev_text.Update(nValue=0, sValue=" ")
-                    player_pl = self.get_player_playlists(mac)
-                    self.update_player_playlist_selector(plsel, player_pl, active_playlist_name=None)
-                    continue
-
-                remote = st.get("remote", 0)
-                rm = st.get("remoteMeta", {})
-                pl_loop = st.get("playlist_loop", [])
+            return None
 
-                title = ""
-                artist = ""
+        full = None
+        count = server.get("player count")
+        if self.discoveryNeeded or count != self.knownPlayerCount or time.time() >= self.nextDiscovery:
+            full = yield "", ["serverstatus", 0, 999]
+            if not full:
+                return None
+
+        probe = yield "", ["playlists", 0, 0]
+        return server, full, probe
+
+    def server_cycle_done(self, cycle):
+        self.metrics.cycle(time.time() - self.cycleStart)
+        if self.profiler.active:
+            self.profiler.cycle_done()
+        if not cycle:
+            self.cycleRunning = False
+            return
 
-                if remote and rm:
-                    title = rm.get("title", "") or title
-                    artist = rm.get("artist", "") or artist
+        server, full, probe = cycle
+        if full is not None:
+            self.discover_players(full.get("players_loop", []) or [])
+            self.knownPlayerCount = full.get("player count", server.get("player count"))
+            self.discoveryNeeded = False
+            self.nextDiscovery = time.time() + self.discoveryInterval
 
-                if not title and isinstance(pl_loop, list) and pl_loop:
-                    title = pl_loop[0].get("title", "") or title
-                    artist = pl_loop[0].get("artist", "") or artist
+        if probe is not None:
+            self.refresh_playlist_catalog(server, probe)
 
-                if not title:
-                    title = st.get("current_title", "")
+        self.server_cycle_finished()
+        # Players are polled in slices, within this heartbeat's budget
+        self.poll_due_players()
 
-                if not title:
-                    label = " "
-                elif artist:
-                    label = f"&#127908; {artist}<br>&#127925; {title}"
-                else:
-                    label = title
-
-                label = label[:255]
-
-                track_index = st.get("playlist_cur_index")
-                player_key = mac
-                changed = False
-
-                if track_index is not None:
-                    if player_key not in self.lastTrackIndex or self.lastTrackIndex[player_key] != track_index:
-                        changed = True
-                        self.lastTrackIndex[player_key] = track_index
-
-                if dev_text.sValue != label or changed:
-                    dev_text.Update(nValue=0, sValue=label)
-
-            if shuffle in Devices:
-                dev_shuffle = Devices[shuffle]
-                try:
-                    shuffle_state = int(st.get("playlist shuffle", 0))
-                except Exception:
-                    shuffle_state = 0
-                level = shuffle_state * 10
-                if dev_shuffle.sValue != str(level):
-                    mode_name = {0: "Off", 1: "Songs", 2: "Albums"}.get(shuffle_state, shuffle_state)
-                    self.log_player(dev_shuffle, f"Shuffle {mode_name}")
-                    dev_shuffle.Update(nValue=0, sValue=str(level))
-
-            if repeat in Devices:
-                dev_repeat = Devices[repeat]
-                try:
-                    repeat_state = int(st.get("playlist repeat", 0))
-                except Exception:
-                    repeat_state = 0
-                level = repeat_state * 10
-                if dev_repeat.sValue != str(level):
-                    mode_name = {0: "Off", 1: "Track", 2: "Playlist"}.get(repeat_state, repeat_state)
-                    # VERANDER 'dev' IN 'dev_repeat' HIERONDER:
-                    self.log_player(dev_repeat, f"Repeat {mode_name}") 
-                    dev_repeat.Update(nValue=0, sValue=str(level))
-
-            player_pl = self.get_player_playlists(mac)
-            playlist_tracks = st.get("playlist_tracks", 0)
-            playlist_name = st.get("playlist_name", "")
-            remote = st.get("remote", 0)
-
-            playlist_is_active = (playlist_tracks > 1 and playlist_name not in ("", None) and remote == 0)
-
-            if playlist_is_active:
-                self.update_player_playlist_selector(plsel, player_pl, active_playlist_name=playlist_name)
-            else:
-                self.update_player_playlist_selector(plsel, player_pl, active_playlist_name=None)
+    def server_cycle_finished(self):
+        self.cycleRunning = False
+        self.log_poll_rates()
+        self.log_write_stats()
+        self.log_budget_stats()
 
         if not self.initialized:
             self.log("Initialization complete:")
@@ -604,34 +2462,271 @@ class LMSPlugin:
             device_count = len(Devices)
             self.log(f" Devices           : {device_count}")
             self.log(f" Max playlists/player : {self.max_playlists}")
-            self.log(f" Poll interval     : {self.pollInterval} sec")
+            self.log(f" Poll interval     : {self.pollInterval} sec (adaptive {self.pollMin:g}-{self.pollMax:g} sec)")
             self.initialized = True
 
+    def discover_players(self, players_loop):
+        """Apply a new player list: create devices for new players, grey out
+        the devices of players that left (once) and restore returning ones."""
+        active = [p for p in players_loop if p.get("playerid") and int(p.get("connected", 1) or 0)]
+        current = {p["playerid"] for p in active}
+        known = {p.get("playerid") for p in self.players}
+
+        for p in active:
+            mac = p["playerid"]
+            units = self.find_player_devices(mac)
+            if not units:
+                self.create_player_devices(p.get("name", "Unknown"), mac)
+            else:
+                if units[PLAYER_ROLES.index("progress")] is None and mac not in self.progressPlayers:
+                    self.create_progress_device(p.get("name", "Unknown"), mac)
+                if mac in self.unavailablePlayers:
+                    self.set_player_available(mac, True)
+            if mac not in known and self.initialized:
+                self.log(f"Player '{p.get('name', mac)}' joined")
+
+        groups_changed = False
+        for mac in set(self.playerUnits) - current:
+            groups_changed = self.syncGroups.forget(mac) or groups_changed
+            if mac not in self.unavailablePlayers:
+                self.set_player_available(mac, False)
+                if mac in known:
+                    name = (self.find_player(mac) or {}).get("name", mac)
+                    self.log(f"Player '{name}' left; devices marked unavailable")
+            self.playerNextPoll.pop(mac, None)
+            self.playerInterval.pop(mac, None)
+            self.progressAnchor.pop(mac, None)
+            self.playerState.pop(mac, None)
+
+        self.players = active
+        if groups_changed:
+            self.sync_groups_changed()
+
+        for name in self.groupDefs:
+            if name not in self.groupUnits:
+                self.create_group_devices(name)
+
+    def set_player_available(self, mac, available):
+        """Clear or set TimedOut on all devices of a player."""
+        if available:
+            self.unavailablePlayers.discard(mac)
+        else:
+            self.unavailablePlayers.add(mac)
+        for unit in self.playerUnits.get(mac) or ():
+            if unit in Devices and bool(Devices[unit].TimedOut) != (not available):
+                dev = Devices[unit]
+                dev.Update(nValue=dev.nValue, sValue=dev.sValue, TimedOut=0 if available else 1)
+                self.writeStats["written"] += 1
+
+    def fetch_player_task(self, mac):
+        """Network part of a player update; safe to run on a worker thread.
+
+        A light status query is enough most of the time. The tagged query
+        with track metadata only runs when the track (index or playlist
+        timestamp) changed, or periodically for remote streams whose
+        remoteMeta changes without a new index.
+        """
+        # Player state only (mode, power, volume, index, ...); no track metadata
+        st = yield mac, ["status"]
+        if not st:
+            return {}
+        if int(st.get("power", 0)) == 0 or st.get("mode") != "play":
+            # No track label shown: metadata not needed
+            return st
+
+        now = time.time()
+        remote = st.get("remote", 0)
+        key = self.track_key(st)
+        cached = self.trackMeta.get(mac)
+        if cached and cached[0] == key and not (remote and now - cached[2] > self.remoteMetaInterval):
+            st.update(cached[1])
+            return st
+
+        full = yield mac, ["status", "-", 1, "tags:adclmntyK"]
+        if not full:
+            return st
+        self.trackMeta[mac] = (key, {k: full[k] for k in TRACK_META_FIELDS if k in full}, now)
+        return full
+
+    def apply_player(self, p, st, throttle=True):
+        """Device part of a player update; runs on the Domoticz thread.
+
+        Only the fields that differ from the previous state are written.
+        Volume and track text writes are throttled (see update_device),
+        except with throttle=False: refreshes after a CLI event or a
+        command show the new value at once.
+        """
+        mac = p.get("playerid")
+        if not mac:
+            return
+
+        devices = self.find_player_devices(mac)
+        if not devices:
+            return
+
+        main, vol, text, actions, shuffle, repeat, plsel, progress = devices
+
+        if progress is not None:
+            self.sync_progress(mac, st)
+
+        state = PlayerState.from_status(st)
+        changes = state.diff(self.playerState.get(mac))
+        self.playerState[mac] = state
+        if not changes:
+            return
+
+        if "power" in changes or "mode" in changes:
+            sel_level = {"pause": 10, "play": 20, "stop": 30}.get(state.mode, 0) if state.power else 0
+            self.update_device(main, 1 if state.power else 0, str(sel_level))
+
+        if "volume" in changes and vol in Devices:
+            Domoticz.Debug(f"LMS Player '{p.get('name')}' - Volume: {state.volume}%")
+            # nValue=2 (Set Level) in plaats van 1 (On): dit dwingt Domoticz
+            # om de sValue (het getal) te tonen op de tegel.
+            self.update_device(vol, 2 if state.volume > 0 else 0, str(state.volume), throttle=throttle)
+
+        if "label" in changes:
+            # Same label on a new track index is not rewritten
+            self.update_device(text, 0, state.label, throttle=throttle)
+
+        if "shuffle" in changes and shuffle in Devices:
+            if self.update_device(shuffle, 1 if state.shuffle > 0 else 0, str(state.shuffle * 10)):
+                mode_name = {0: "Off", 1: "Songs", 2: "Albums"}.get(state.shuffle, state.shuffle)
+                self.log_player(Devices[shuffle], f"Shuffle {mode_name}")
+
+        if "repeat" in changes and repeat in Devices:
+            if self.update_device(repeat, 1 if state.repeat > 0 else 0, str(state.repeat * 10)):
+                mode_name = {0: "Off", 1: "Track", 2: "Playlist"}.get(state.repeat, state.repeat)
+                self.log_player(Devices[repeat], f"Repeat {mode_name}")
+
+        if "playlist" in changes:
+            self.update_player_playlist_selector(plsel, active_playlist_name=state.playlist)
+
+        if "sync_master" in changes or "sync_slaves" in changes:
+            if self.syncGroups.update(mac, state.sync_master, state.sync_slaves):
+                self.sync_groups_changed()
+
+    # ------------------------------------------------------------------
+    # TRACK PROGRESS (interpolated between polls)
+    # ------------------------------------------------------------------
+    @staticmethod
+    def progress_elapsed(anchor, now):
+        elapsed, duration, rate, synced, _, _ = anchor
+        elapsed += (now - synced) * rate
+        return min(elapsed, duration) if duration > 0 else elapsed
+
+    @staticmethod
+    def format_time(seconds):
+        seconds = int(max(0, seconds))
+        hours, rest = divmod(seconds, 3600)
+        if hours:
+            return f"{hours}:{rest // 60:02d}:{rest % 60:02d}"
+        return f"{rest // 60}:{rest % 60:02d}"
+
+    def sync_progress(self, mac, st):
+        """Take a new anchor from a status reply when the track or the
+        playback state changed or the local count drifted; otherwise keep
+        counting locally."""
+        now = time.time()
+        try:
+            elapsed = float(st.get("time", 0) or 0)
+            duration = float(st.get("duration", 0) or 0)
+            rate = float(st.get("rate", 1) or 0)
+        except (TypeError, ValueError):
+            elapsed, duration, rate = 0.0, 0.0, 0.0
+        mode = st.get("mode", "stop") if int(st.get("power", 0)) else "off"
+        key = self.track_key(st)
+
+        anchor = self.progressAnchor.get(mac)
+        if anchor and anchor[4] == key and anchor[5] == mode:
+            drift = abs(self.progress_elapsed(anchor, now) - elapsed)
+            if drift <= self.progressDrift:
+                return
+            self.debug_log(f"Progress of {mac} drifted {drift:.1f}s, resyncing")
+
+        self.progressAnchor[mac] = (elapsed, duration, rate if mode == "play" else 0.0, now, key, mode)
+        self.write_progress(mac, now, force=True)
+
+    def write_progress(self, mac, now, force=False):
+        units = self.playerUnits.get(mac)
+        unit = units[PLAYER_ROLES.index("progress")] if units else None
+        anchor = self.progressAnchor.get(mac)
+        if unit is None or anchor is None:
+            return
+        if not force and now - self.lastWriteTime.get(unit, 0) < self.progressInterval:
+            return
+
+        if anchor[5] not in ("play", "pause"):
+            text = " "
+        elif anchor[1] > 0:
+            text = f"{self.format_time(self.progress_elapsed(anchor, now))} / {self.format_time(anchor[1])}"
+        else:
+            # Radio streams: no duration, only the time played
+            text = self.format_time(self.progress_elapsed(anchor, now))
+        self.update_device(unit, 0, text)
+
+    def update_progress(self):
+        """Advance the Progress devices of playing players; no network."""
+        if not self.progressAnchor or not self.progressInterval or self.breaker.is_open:
+            return
+        now = time.time()
+        for mac, anchor in self.progressAnchor.items():
+            if anchor[2] > 0:
+                self.write_progress(mac, now)
+
     # ------------------------------------------------------------------
     # COMMAND HANDLER
     # ------------------------------------------------------------------
     def onCommand(self, Unit, Command, Level, Hue):
+        start = time.time()
+        try:
+            if self.profiler.active and self.profiler.take_command():
+                self.profiler.call(self.dispatch_command, Unit, Command, Level, Hue)
+            else:
+                self.dispatch_command(Unit, Command, Level, Hue)
+        finally:
+            elapsed = time.time() - start
+            self.metrics.command(elapsed)
+            self.commandBlockMax = max(self.commandBlockMax, elapsed)
+            msg = f"onCommand blocked {elapsed * 1000:.1f} ms (max {self.commandBlockMax * 1000:.1f} ms)"
+            if elapsed > self.commandBlockWarn:
+                self.log(msg)
+            else:
+                self.debug_log(msg)
+
+    def dispatch_command(self, Unit, Command, Level, Hue):
         if Unit not in Devices:
             return
 
         dev = Devices[Unit]
         devname = dev.Name
-        mac = dev.Description
+        if Unit == self.profileUnit:
+            self.handle_profile_device(Command)
+            return
+        if Unit in self.groupIndex:
+            self.handle_group(dev, Command, Level)
+            return
+
+        mac, role = self.unitIndex.get(Unit) or (self.description_mac(dev.Description), self.device_role(devname))
 
         self.debug_log(f"onCommand: Unit={Unit}, Name={devname}, Command={Command}, Level={Level}, mac={mac}")
 
-        if "Playlists" in devname and Command == "Set Level":
+        # Devices are set ahead of the server: compare the next status with
+        # the devices again, not with the previous status
+        self.playerState.pop(mac, None)
+
+        if role == "playlists" and Command == "Set Level":
             if Level == 0:
-                dev.Update(nValue=0, sValue="0")
+                self.update_device(Unit, 0, "0")
                 return
-            self.play_playlist_for_player(mac, Level)
+            self.handle_playlist_selector(dev, mac, Level)
             return
 
-        if "Actions" in devname and Command == "Set Level":
+        if role == "actions" and Command == "Set Level":
             self.handle_actions(dev, mac, Level)
             return
 
-        if "Shuffle" in devname:
+        if role == "shuffle":
             if Command == "Set Level":
                 mode = int(Level // 10)
             elif Command == "Off":
@@ -642,12 +2737,12 @@ class LMSPlugin:
 
             self.send_playercmd(mac, ["playlist", "shuffle", str(mode)])
             nval = 1 if mode > 0 else 0
-            dev.Update(nValue=nval, sValue=str(Level))
+            self.update_device(dev.Unit, nval, str(Level))
             mode_name = {0: "Off", 1: "Songs", 2: "Albums"}.get(mode, f"Unknown ({mode})")
             self.log_player(dev, f"Shuffle {mode_name}")
             return
 
-        if "Repeat" in devname:
+        if role == "repeat":
             if Command == "Set Level":
                 mode = int(Level // 10)
             elif Command == "Off":
@@ -658,7 +2753,7 @@ class LMSPlugin:
 
             self.send_playercmd(mac, ["playlist", "repeat", str(mode)])
             nval = 1 if mode > 0 else 0
-            dev.Update(nValue=nval, sValue=str(Level))
+            self.update_device(dev.Unit, nval, str(Level))
             mode_name = {0: "Off", 1: "Track", 2: "Playlist"}.get(mode, f"Unknown ({mode})")
             # Correctie: dev gebruiken in plaats van dev_repeat
             self.log_player(dev, f"Repeat {mode_name}")
@@ -666,20 +2761,20 @@ class LMSPlugin:
 
             self.send_playercmd(mac, ["playlist", "repeat", str(mode)])
             nval = 1 if mode > 0 else 0
-            dev.Update(nValue=nval, sValue=str(Level))
+            self.update_device(dev.Unit, nval, str(Level))
             mode_name = {0: "Off", 1: "Track", 2: "Playlist"}.get(mode, f"Unknown ({mode})")
             self.log_player(dev_repeat, f"Repeat {mode_name}")
             return
 
-        if Command in ["On", "Off"] and self.is_main_device_name(devname):
+        if Command in ["On", "Off"] and role == "main":
             self.handle_power(dev, mac, Command)
             return
 
-        if "Volume" in devname and Command == "Set Level":
+        if role == "volume" and Command == "Set Level":
             self.handle_volume(dev, mac, Level)
             return
 
-        if Command == "Set Level" and self.is_main_device_name(devname):
+        if Command == "Set Level" and role == "main":
             self.handle_main_playback(dev, mac, Level)
             return
 
@@ -689,7 +2784,7 @@ class LMSPlugin:
     def handle_volume(self, dev, mac, Level):
         self.send_playercmd(mac, ["mixer", "volume", str(Level)])
         # nValue=2 forceert de weergave van het getal (percentage) op de tegel
-        dev.Update(nValue=2 if Level > 0 else 0, sValue=str(Level))
+        self.update_device(dev.Unit, 2 if Level > 0 else 0, str(Level))
         self.log_player(dev, f"Volume {Level}%")
 
     def handle_actions(self, dev, mac, Level):
@@ -699,33 +2794,168 @@ class LMSPlugin:
                 self.send_display_text(mac, self.displayText)
             else:
                 self.log("No display text configured in parameters (Mode4).")
-            dev.Update(nValue=0, sValue="0") # Reset naar 'None'
+            self.update_device(dev.Unit, 0, "0") # Reset naar 'None'
             return
 
         if Level == 20:
-            self.log(f"Syncing all players TO master: {mac}")
-            server = self.get_serverstatus()
-            if not server:
-                self.error("Cannot sync: server not responding.")
-                return
-            players = server.get("players_loop", [])
-            for p in players:
-                other_mac = p.get("playerid")
-                if other_mac and other_mac != mac:
-                    self.log(f" -> syncing {other_mac} to master {mac}")
-                    self.send_playercmd(other_mac, ["sync", mac])
-            dev.Update(nValue=1, sValue=str(Level))
+            self.sync_to_master(dev, mac)
+            self.update_device(dev.Unit, 1, str(Level))
             return
 
         if Level == 30:
             self.log_player(dev, "Unsync")
             self.send_playercmd(mac, ["sync", "-"])
-            dev.Update(nValue=1, sValue=str(Level))
+            self.update_device(dev.Unit, 1, str(Level))
+            return
+
+    def player_name(self, mac):
+        return (self.find_player(mac) or {}).get("name", mac)
+
+    def sync_to_master(self, dev, mac):
+        """Sync every known, available player to this one, all at once."""
+        in_group = set(self.syncGroups.group_of(mac))
+        targets = [
+            p["playerid"] for p in self.players
+            if p.get("playerid") and p["playerid"] != mac
+            and p["playerid"] not in self.unavailablePlayers and p["playerid"] not in in_group
+        ]
+        if not targets:
+            self.log_player(dev, "Sync: all players already synced")
+            return
+        self.log_player(dev, f"Syncing {len(targets)} player(s) to this player")
+
+        def synced(oks):
+            done = [self.player_name(t) for t, ok in zip(targets, oks) if ok]
+            failed = [self.player_name(t) for t, ok in zip(targets, oks) if not ok]
+            summary = f"Sync to '{self.player_name(mac)}': {len(done)}/{len(targets)} synced"
+            if done:
+                summary += f" ({', '.join(done)})"
+            if failed:
+                self.error(f"{summary}, failed: {', '.join(failed)}")
+            else:
+                self.log(summary)
+            self.request_refresh(mac, self.refreshDelay)
+
+        self.send_batch([(t, ["sync", mac]) for t in targets], synced)
+
+    def sync_groups_changed(self):
+        """Log the new sync groups and show them on the Actions selectors:
+        'Sync to this' on a group master, 'None' on all other players."""
+        groups = self.syncGroups.groups()
+        if groups:
+            for master, members in groups.items():
+                self.log(f"Sync group: {', '.join(self.player_name(m) for m in members)} (master {self.player_name(master)})")
+        else:
+            self.log("Sync groups: none")
+        for mac, units in self.playerUnits.items():
+            actions = units[PLAYER_ROLES.index("actions")]
+            if mac in groups:
+                self.update_device(actions, 1, "20")
+            elif actions in Devices and Devices[actions].sValue in ("20", "30"):
+                self.update_device(actions, 0, "0")
+
+    # ------------------------------------------------------------------
+    # Profiling
+    # ------------------------------------------------------------------
+    def start_profiling(self):
+        if not self.profiler.start(self.profileCycles, memory=self.profileMemory):
+            self.log("Profiling already running")
+            return
+        self.update_device(self.profileUnit, 1, "")
+        memory = " and memory" if self.profiler.memory else ""
+        self.log(f"Profiling{memory} started for {self.profileCycles} poll cycle(s)")
+
+    def stop_profiling(self):
+        cycles, commands = self.profiler.cycles, self.profiler.commands
+        try:
+            paths = self.profiler.stop()
+        except (OSError, ValueError) as e:
+            self.error(f"Unable to write profile: {e}")
+        else:
+            self.log(f"Profiling done ({cycles} poll cycle(s), {commands} command(s)): {', '.join(paths)}")
+        self.update_device(self.profileUnit, 0, "")
+
+    def handle_profile_device(self, Command):
+        if Command == "On":
+            self.start_profiling()
+        elif Command == "Off" and self.profiler.active:
+            self.stop_profiling()
+
+    # ------------------------------------------------------------------
+    # Group devices
+    # ------------------------------------------------------------------
+    def group_members(self, name):
+        """Available players of a group, in player list order."""
+        if name not in self.groupDefs:
+            return []
+        wanted = self.groupDefs[name]
+        wanted = {m.lower() for m in wanted} if wanted is not None else None
+        return [
+            p["playerid"] for p in self.players
+            if p.get("playerid") and p["playerid"] not in self.unavailablePlayers
+            and (wanted is None or p["playerid"].lower() in wanted or p.get("name", "").lower() in wanted)
+        ]
+
+    def handle_group(self, dev, Command, Level):
+        """Send one command to every member at once (send_batch); the members
+        are re-read together afterwards, see group_done."""
+        name, role = self.groupIndex[dev.Unit]
+        on = Command == "On"
+        if role == "volume" and Command == "Set Level":
+            cmd = ["mixer", "volume", str(Level)]
+            value = (2 if Level > 0 else 0, str(Level))
+            label = f"Volume {Level}%"
+        elif role == "control" and Command in ("On", "Off"):
+            cmd = ["power", "1" if on else "0"]
+            value = (1 if on else 0, "")
+            label = f"Power {Command}"
+        elif role == "pause" and Command in ("On", "Off"):
+            cmd = ["pause", "1" if on else "0"]
+            value = (1 if on else 0, "")
+            label = "Pause" if on else "Resume"
+        else:
             return
 
+        members = self.group_members(name)
+        if not members:
+            self.log(f"{name} | {label}: no players available")
+            return
+        self.update_device(dev.Unit, *value)
+        self.log(f"{name} | {label} ({len(members)} player(s))")
+        self.send_batch([(mac, cmd) for mac in members],
+                        lambda oks: self.group_done(name, label, members, oks), refresh=False)
+
+    def group_done(self, name, label, members, oks):
+        failed = [self.player_name(m) for m, ok in zip(members, oks) if not ok]
+        summary = f"{name} | {label}: {oks.count(True)}/{len(members)} player(s)"
+        if failed:
+            self.error(f"{summary}, failed: {', '.join(failed)}")
+        else:
+            self.debug_log(summary)
+        # All members due at the same moment: one gathered poll (poll_due_players)
+        # reconciles their devices instead of a refresh per player
+        due = time.time() + self.refreshDelay
+        for mac in members:
+            self.playerNextPoll[mac] = min(self.playerNextPoll.get(mac, due), due)
+
+    def update_group_devices(self):
+        """Show the members' state on the group devices: Control on when any
+        member is on, Volume the average of the members that are on, Pause on
+        when every member that is on is paused."""
+        for name, (control, volume, pause) in self.groupUnits.items():
+            states = [self.playerState[mac] for mac in self.group_members(name) if mac in self.playerState]
+            if not states:
+                continue
+            on = [st for st in states if st.power]
+            self.update_device(control, 1 if on else 0, "")
+            level = round(sum(st.volume for st in on or states) / len(on or states))
+            self.update_device(volume, 2 if level > 0 else 0, str(level), throttle=True)
+            paused = bool(on) and all(st.mode == "pause" for st in on)
+            self.update_device(pause, 1 if paused else 0, "")
+
     def handle_power(self, dev, mac, Command):
         self.send_playercmd(mac, ["power", "1" if Command == "On" else "0"])
-        dev.Update(nValue=1 if Command == "On" else 0, sValue="")
+        self.update_device(dev.Unit, 1 if Command == "On" else 0, "")
         self.log_player(dev, f"Power {Command}")
 
     def handle_main_playback(self, dev, mac, Level):
@@ -738,13 +2968,110 @@ class LMSPlugin:
             return
         cmd, label = btn_map[Level]
         self.send_button(mac, cmd)
-        dev.Update(nValue=1, sValue=str(Level))
+        self.update_device(dev.Unit, 1, str(Level))
         self.log_player(dev, label)
 
+class LMSServerGroup:
+    """Target of the Domoticz hooks: one LMSPlugin per server.
+
+    The Address field may list several servers ('host[:port], ...'). Each
+    has its own transport, circuit breaker, event listener and poll
+    schedule, and polls from its own threads. Units all come from the one
+    Devices dict on the Domoticz thread, so allocation cannot collide.
+    The first server keeps the plain mac as device Description, as before;
+    the others use 'mac@host' and put the host in front of device names.
+    """
+
+    def __init__(self):
+        self.servers = []
+
+    @staticmethod
+    def parse_servers(address, default_port):
+        """'host[:port], ...' -> [(host, port, label)]"""
+        servers = []
+        for entry in (address or "").split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            host, _, port = entry.partition(":")
+            servers.append((host.strip(), port.strip() or str(default_port), entry))
+        return servers
+
+    @staticmethod
+    def load_icons():
+        _IMAGE = "lyrion"
+        creating_new_icon = _IMAGE not in Images
+        Domoticz.Image(f"{_IMAGE}.zip").Create()
+
+        if _IMAGE not in Images:
+            Domoticz.Error(f"Unable to load icon pack '{_IMAGE}.zip'")
+            return 0
+        image_id = Images[_IMAGE].ID
+        if creating_new_icon:
+            Domoticz.Log("Icons created and loaded.")
+        else:
+            Domoticz.Log(f"Icons found in database (ImageID={image_id}).")
+        return image_id
+
+    def server_for_unit(self, Unit):
+        for server in self.servers:
+            if Unit in server.unitIndex or Unit in server.groupIndex or Unit == server.profileUnit:
+                return server
+        if Unit in Devices:
+            for server in self.servers:
+                if server.description_mac(Devices[Unit].Description):
+                    return server
+        return None
+
+    def onStart(self):
+        Domoticz.Log(f"Starting Plugin version {Parameters['Version']}")
+        image_id = self.load_icons()
+
+        entries = self.parse_servers(Parameters.get("Address", ""), Parameters.get("Port", "9000"))
+        multi = len(entries) > 1
+        self.servers = [
+            LMSPlugin(host, port, label=label if multi else "", namespace=label if index else "", background=multi)
+            for index, (host, port, label) in enumerate(entries)
+        ]
+        if multi:
+            Domoticz.Log(f"{len(self.servers)} servers: {', '.join(label for _, _, label in entries)}")
+        for server in self.servers:
+            server.imageID = image_id
+            server.onStart()
+
+    def onStop(self):
+        for server in self.servers:
+            server.onStop()
+
+    def onHeartbeat(self):
+        for server in self.servers:
+            server.onHeartbeat()
+
+    def onDeviceRemoved(self, Unit):
+        for server in self.servers:
+            server.onDeviceRemoved(Unit)
+
+    def onConnect(self, Connection, Status, Description):
+        for server in self.servers:
+            server.onConnect(Connection, Status, Description)
+
+    def onMessage(self, Connection, Data):
+        for server in self.servers:
+            server.onMessage(Connection, Data)
+
+    def onDisconnect(self, Connection):
+        for server in self.servers:
+            server.onDisconnect(Connection)
+
+    def onCommand(self, Unit, Command, Level, Hue):
+        server = self.server_for_unit(Unit)
+        if server is not None:
+            server.onCommand(Unit, Command, Level, Hue)
+
 # -------------------------------------------------------------------
 # DOMOTICZ HOOKS
 # -------------------------------------------------------------------
-_plugin = LMSPlugin()
+_plugin = LMSServerGroup()
 
 def onStart():
     _plugin.onStart()
@@ -755,5 +3082,17 @@ def onStop():
 def onHeartbeat():
     _plugin.onHeartbeat()
 
+def onDeviceRemoved(Unit):
+    _plugin.onDeviceRemoved(Unit)
+
+def onConnect(Connection, Status, Description):
+    _plugin.onConnect(Connection, Status, Description)
+
+def onMessage(Connection, Data):
+    _plugin.onMessage(Connection, Data)
+
+def onDisconnect(Connection):
+    _plugin.onDisconnect(Connection)
+
 def onCommand(Unit, Command, Level, Hue):
     _plugin.onCommand(Unit, Command, Level, Hue)
@@ -0,0 +1,105 @@
+"""On-demand profiling for the Lyrion plugin.
+
+A run profiles the plugin hooks with cProfile (and optionally
+tracemalloc) for a number of poll cycles, writes timestamped dumps to the
+plugin folder and switches itself off.
+Without a run the hooks only test `active`.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+
+
+class Profiler:
+    def __init__(self, folder="", prefix="lyrion_profile"):
+        self.folder = folder
+        self.prefix = prefix
+        self.active = False
+        self.profile = None
+        self.memory = False
+        self.cycles = 0
+        self.maxCycles = 0
+        self.commands = 0
+        self.started = 0.0
+
+    def start(self, cycles, memory=False):
+        """Start a run of `cycles` poll cycles (and at most as many
+        commands); False when a run is already active."""
+        if self.active:
+            return False
+        self.profile = cProfile.Profile()
+        self.cycles = 0
+        self.maxCycles = max(1, cycles)
+        self.commands = 0
+        # tracemalloc is process-wide: leave it alone when someone else runs it
+        self.memory = memory and not tracemalloc.is_tracing()
+        if self.memory:
+            tracemalloc.start(25)
+        self.started = time.time()
+        self.active = True
+        return True
+
+    def call(self, func, *args):
+        """func(*args) with the profiler enabled."""
+        try:
+            self.profile.enable()
+        except ValueError:
+            # Another profiler is active on this thread (e.g. a second server)
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            self.profile.disable()
+
+    def take_command(self):
+        """True when the next onCommand is to be profiled."""
+        if self.commands >= self.maxCycles:
+            return False
+        self.commands += 1
+        return True
+
+    def cycle_done(self):
+        self.cycles += 1
+
+    @property
+    def finished(self):
+        return self.active and self.cycles >= self.maxCycles
+
+    def stop(self):
+        """End the run and write the dumps: '<prefix>_<time>.prof' (pstats,
+        snakeviz, ...), a '.txt' with the top functions and, with memory,
+        '_memory.txt'. Returns the paths written."""
+        self.active = False
+        profile, self.profile = self.profile, None
+        elapsed = time.time() - self.started
+        base = os.path.join(self.folder, f"{self.prefix}_{time.strftime('%Y%m%d-%H%M%S')}")
+        paths = []
+
+        memory = None
+        if self.memory:
+            memory = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            self.memory = False
+
+        profile.dump_stats(base + ".prof")
+        paths.append(base + ".prof")
+
+        out = io.StringIO()
+        out.write(f"{self.cycles} poll cycle(s), {self.commands} command(s) in {elapsed:.1f}s\n\n")
+        pstats.Stats(profile, stream=out).sort_stats("cumulative").print_stats(40)
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+        paths.append(base + ".txt")
+
+        if memory is not None:
+            stats = memory.statistics("lineno")
+            with open(base + "_memory.txt", "w", encoding="utf-8") as f:
+                f.write(f"{sum(s.size for s in stats) / 1024:.0f} KiB traced, top 30 by line:\n\n")
+                for stat in stats[:30]:
+                    f.write(f"{stat}\n")
+            paths.append(base + "_memory.txt")
+        return paths
@@ -0,0 +1,127 @@
+"""Record and replay LMS traffic for the Lyrion plugin.
+
+Recorder appends every request and its reply (or error), with timing, to
+a JSON Lines file:
+
+    {"t": 1700000000.123, "ms": 12.4, "p": "00:04:20:..", "c": ["status"], "r": {...}}
+    {"t": 1700000000.456, "ms": 10001.0, "p": "", "c": ["serverstatus", 0, 0], "e": "Read timed out"}
+
+ReplayTransport serves such a file instead of a server: it has the
+post() of HttpTransport, so the plugin logic runs unchanged on recorded
+production data.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+
+class Recorder:
+    """Append-only request log; stops by itself at max_bytes."""
+
+    def __init__(self, path, max_bytes=50 * 1024 * 1024, log=None):
+        self.path = path
+        self.maxBytes = max_bytes
+        self.log = log or (lambda msg: None)
+        self.lock = threading.Lock()
+        self.file = open(path, "a", encoding="utf-8")
+        self.size = self.file.tell()
+        self.records = 0
+
+    @property
+    def active(self):
+        return self.file is not None
+
+    def write(self, player, cmd_array, start, elapsed, result=None, error=None):
+        entry = {"t": round(start, 3), "ms": round(elapsed * 1000, 1), "p": player, "c": cmd_array}
+        if error is not None:
+            entry["e"] = str(error)
+        else:
+            entry["r"] = result
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self.lock:
+            if self.file is None:
+                return
+            self.file.write(line)
+            self.file.flush()
+            self.size += len(line)
+            self.records += 1
+            if self.size >= self.maxBytes:
+                self.log(f"Recording stopped at {self.size / 1024 / 1024:.0f} MB ({self.records} requests): {self.path}")
+                self._close()
+
+    def close(self):
+        with self.lock:
+            self._close()
+
+    def _close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class ReplayError(Exception):
+    """The recording has no reply for a request, or recorded an error."""
+
+
+class ReplayTransport:
+    """Answers requests from a recording.
+
+    Replies are looked up by player and command. Every request for the
+    same player and command gets the next recorded reply, wrapping around
+    at the end, so a short recording can drive a long run. speed=1 waits
+    the recorded time per request, speed=10 a tenth of it, and speed=0
+    answers at once.
+    """
+
+    def __init__(self, path, speed=1.0, debug_log=None):
+        self.speed = speed
+        self.debug_log = debug_log or (lambda msg: None)
+        self.lock = threading.Lock()
+        self.replies = collections.defaultdict(list)
+        self.position = collections.Counter()
+        self.requests_sent = 0
+        self.misses = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A line cut short when recording was interrupted
+                    continue
+                self.replies[self.key(entry.get("p", ""), entry.get("c") or [])].append(entry)
+        self.debug_log(f"Replay: {sum(len(r) for r in self.replies.values())} requests loaded from {os.path.basename(path)}")
+
+    @staticmethod
+    def key(player, cmd_array):
+        return player, tuple(str(c) for c in cmd_array)
+
+    def post(self, data, timeout=None):
+        player, cmd_array = data["params"]
+        key = self.key(player, cmd_array)
+        with self.lock:
+            self.requests_sent += 1
+            entries = self.replies.get(key)
+            if not entries:
+                self.misses += 1
+                entry = None
+            else:
+                entry = entries[self.position[key] % len(entries)]
+                self.position[key] += 1
+        if entry is None:
+            self.debug_log(f"Replay: no recorded reply for {player or '-'} {' '.join(key[1])}")
+            raise ReplayError(f"not recorded: {' '.join(key[1])}")
+
+        if self.speed > 0:
+            delay = entry.get("ms", 0) / 1000.0 / self.speed
+            if timeout:
+                delay = min(delay, timeout)
+            time.sleep(delay)
+        if "e" in entry:
+            raise ReplayError(entry["e"])
+        return {"id": data.get("id"), "method": "slim.request", "params": [player, cmd_array], "result": entry.get("r")}
+
+    def close(self):
+        pass